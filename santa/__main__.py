@@ -1,4 +1,4 @@
-from . import _initer, _solver, _tester
+from . import _batch, _bencher, _generators, _initer, _solver, _tester
 from ._typer import app, command
 
 command(
@@ -16,4 +16,21 @@ command(
     help="Test puzzle",
 )(_tester.test_handler)
 
-app()
+command(
+    name="bench",
+    help="Benchmark puzzle solutions",
+)(_bencher.bench_handler)
+
+app.command(
+    name="solve-all",
+    help="Solve or test every puzzle of a year or of the whole calendar",
+)(_batch.solve_all_handler)
+
+app.command(
+    name="generate",
+    help="Generate large synthetic inputs for scaling benchmarks",
+)(_generators.generate_handler)
+
+# NOTE: Guarded because worker processes are spawned and re-import main module.
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,187 @@
+import os
+import re
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Annotated, Literal
+
+import typer
+from loguru import logger
+
+from ._cache import AnswerCache
+from ._langs import Lang
+from ._metrics import format_seconds, format_table
+from ._solver import build_puzzle, solve_puzzle
+from ._tester import collect_tests, resolve_subcases
+from ._typer import InProcess, Jobs, Part, UseCache
+from ._utils import get_daily_present_root, get_event_root, resolve_parts
+from ._workers import WorkerPool
+
+YEAR_RE = re.compile(r"y(?P<year>\d{4})")
+DAY_RE = re.compile(r"d(?P<day>\d{2})")
+
+# NOTE: Days are independent, so the sweep uses every core unless told otherwise.
+DEFAULT_JOBS = os.cpu_count() or 1
+
+
+@dataclass(frozen=True, order=True, slots=True)
+class DailyPuzzle:
+    year: int
+    day: int
+    lang: Lang
+
+
+@dataclass(kw_only=True, slots=True)
+class DailyReport:
+    puzzle: DailyPuzzle
+    status: Literal["OK", "FAIL", "ERROR"] = "OK"
+    elapsed: float = 0.0
+    details: list[str] = field(default_factory=list)
+
+
+def solve_all_handler(
+    *,
+    year: Annotated[
+        int | None,
+        typer.Option("-y", "--year", help="Contest year. Mutually exclusive with --all"),
+    ] = None,
+    all_years: Annotated[
+        bool,
+        typer.Option("--all", help="Run every year found in presents"),
+    ] = False,
+    langs: Annotated[
+        list[Lang] | None,
+        typer.Option("-l", "--lang", help="Solution languages. Leave blank for all languages"),
+    ] = None,
+    test: Annotated[
+        bool,
+        typer.Option("--test", help="Run examples and check answers instead of solving inputs"),
+    ] = False,
+    part: Part = None,
+    in_process: InProcess = True,
+    jobs: Jobs = DEFAULT_JOBS,
+    use_cache: UseCache = True,
+) -> None:
+    if (year is None) == (not all_years):
+        raise typer.BadParameter("Exactly one of --year and --all must be passed")
+
+    puzzles = discover_puzzles(year=year, langs=langs or list(Lang))
+    if len(puzzles) == 0:
+        raise typer.BadParameter("No puzzles found")
+    logger.info(f"Found {len(puzzles)} puzzles")
+
+    cache = AnswerCache() if use_cache else None
+    with WorkerPool(size=jobs) as pool, ThreadPoolExecutor(max_workers=jobs) as executor:
+
+        def run(puzzle: DailyPuzzle) -> DailyReport:
+            return run_puzzle(
+                puzzle, part=part, test=test, in_process=in_process, pool=pool, cache=cache
+            )
+
+        reports = list(executor.map(run, puzzles))
+
+    typer.echo(format_reports(reports))
+    if any(report.status != "OK" for report in reports):
+        raise typer.Exit(1)
+
+
+def discover_puzzles(*, year: int | None, langs: Sequence[Lang]) -> list[DailyPuzzle]:
+    puzzles: list[DailyPuzzle] = []
+    for lang in langs:
+        for daily_root in get_event_root(lang).glob("y*/d*"):
+            if (year_match := YEAR_RE.fullmatch(daily_root.parent.name)) is None or (
+                day_match := DAY_RE.fullmatch(daily_root.name)
+            ) is None:
+                continue
+
+            puzzle = DailyPuzzle(
+                year=int(year_match["year"]),
+                day=int(day_match["day"]),
+                lang=lang,
+            )
+            if year is not None and puzzle.year != year:
+                continue
+            if not get_daily_present_root(year=puzzle.year, day=puzzle.day).exists():
+                logger.warning(f"Presents not found for {puzzle}")
+                continue
+            puzzles.append(puzzle)
+
+    return sorted(puzzles)
+
+
+def run_puzzle(
+    puzzle: DailyPuzzle,
+    /,
+    *,
+    part: int | None,
+    test: bool,
+    in_process: bool,
+    pool: WorkerPool,
+    cache: AnswerCache | None,
+) -> DailyReport:
+    report = DailyReport(puzzle=puzzle)
+    present_root = get_daily_present_root(year=puzzle.year, day=puzzle.day)
+    start = time.perf_counter()
+    try:
+        build_puzzle(lang=puzzle.lang, year=puzzle.year, day=puzzle.day)
+        if test:
+            subcases = resolve_subcases(collect_tests(present_root), resolve_parts(part))
+            for subcase in subcases:
+                solutions = solve_puzzle(
+                    lang=puzzle.lang,
+                    year=puzzle.year,
+                    day=puzzle.day,
+                    part=subcase.part,
+                    input_path=subcase.puzzle,
+                    suppress_stdout=True,
+                    in_process=in_process,
+                    pool=pool,
+                    build=False,
+                    cache=cache,
+                )
+                if len(solutions) == 0 or solutions[0]["answer"] != subcase.answer:
+                    report.status = "FAIL"
+                    report.details.append(f"n{subcase.idx}/p{subcase.part}")
+            if report.status == "OK":
+                report.details.append(f"{len(subcases)} passed")
+        else:
+            solutions = solve_puzzle(
+                lang=puzzle.lang,
+                year=puzzle.year,
+                day=puzzle.day,
+                part=part,
+                input_path=present_root / "input.txt",
+                suppress_stdout=True,
+                in_process=in_process,
+                pool=pool,
+                build=False,
+                cache=cache,
+            )
+            report.details.extend(f"p{s['part']}={s['answer']}" for s in solutions)
+            if len(solutions) != len(resolve_parts(part)):
+                report.status = "FAIL"
+    except Exception as e:  # noqa: BLE001
+        message = (str(e).strip().splitlines() or [""])[-1]
+        logger.warning(f"Failed to run {puzzle}: {message}")
+        report.status = "ERROR"
+        report.details.append(type(e).__name__)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def format_reports(reports: Sequence[DailyReport], /) -> str:
+    return format_table(
+        ("YEAR", "DAY", "LANG", "STATUS", "TIME", "DETAILS"),
+        [
+            (
+                str(report.puzzle.year),
+                f"{report.puzzle.day:02d}",
+                report.puzzle.lang.value,
+                report.status,
+                format_seconds(report.elapsed),
+                " ".join(report.details),
+            )
+            for report in reports
+        ],
+    )
@@ -0,0 +1,361 @@
+import functools
+import math
+import statistics
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Annotated, Literal
+
+import typer
+from loguru import logger
+
+from ._defs import BENCH_HISTORY_PATH, ROOT
+from ._generators import YEAR_DAY_TO_GENERATOR, generate_input, parse_size
+from ._history import BenchRecord, append_records, find_baseline, load_records
+from ._langs import Lang
+from ._metrics import format_seconds, format_table
+from ._solver import build_puzzle, solve_puzzle
+from ._typer import CommonOpts, InProcess, Part
+from ._utils import (
+    get_daily_present_root,
+    get_daily_solution_root,
+    get_git_revision,
+    resolve_engine,
+    resolve_parts,
+)
+from ._workers import WorkerPool
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class BenchStats:
+    lang: Lang
+    part: Literal[1, 2]
+    input_path: Path
+    input_size: int
+    runs: int
+    min_s: float
+    median_s: float
+    p95_s: float
+    stddev_s: float
+    max_rss_kb: int
+
+    @classmethod
+    def from_samples(
+        cls,
+        *,
+        lang: Lang,
+        part: Literal[1, 2],
+        input_path: Path,
+        samples: Sequence[float],
+        max_rss_kb: int,
+    ) -> "BenchStats":
+        assert len(samples) > 0, "At least one sample is required"
+        return cls(
+            lang=lang,
+            part=part,
+            input_path=input_path,
+            input_size=input_path.stat().st_size,
+            runs=len(samples),
+            min_s=min(samples),
+            median_s=statistics.median(samples),
+            p95_s=(
+                statistics.quantiles(samples, n=20, method="inclusive")[18]
+                if len(samples) > 1
+                else samples[0]
+            ),
+            stddev_s=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            max_rss_kb=max_rss_kb,
+        )
+
+
+def bench_handler(
+    *,
+    ctx: typer.Context,
+    part: Part = None,
+    in_process: InProcess = True,
+    repeat: Annotated[
+        int,
+        typer.Option("-n", "--repeat", help="How many measured runs per part", min=1),
+    ] = 10,
+    warmup: Annotated[
+        int,
+        typer.Option("-w", "--warmup", help="How many unmeasured runs per part", min=0),
+    ] = 1,
+    versus: Annotated[
+        list[Lang] | None,
+        typer.Option("--vs", help="Other languages to benchmark on the same input"),
+    ] = None,
+    save: Annotated[
+        bool,
+        typer.Option("--save/--no-save", help="Append results to benchmark history"),
+    ] = True,
+    compare: Annotated[
+        bool,
+        typer.Option("--compare", help="Compare results against benchmark history"),
+    ] = False,
+    baseline: Annotated[
+        str | None,
+        typer.Option(help="Git revision to compare against. Defaults to latest other revision"),
+    ] = None,
+    threshold: Annotated[
+        float,
+        typer.Option(help="Relative slowdown of median treated as regression", min=0.0),
+    ] = 0.1,
+    scale: Annotated[
+        list[int] | None,
+        typer.Option(
+            help="Benchmark on generated inputs of these sizes instead, e.g. 1MB, 100MB or 1GB",
+            parser=parse_size,
+            metavar="SIZE",
+        ),
+    ] = None,
+) -> None:
+    opts = getattr(ctx, CommonOpts.ATTRNAME, ...)
+    assert isinstance(opts, CommonOpts), f"Typer context does not contain expected options: {opts}"
+
+    input_paths = [get_daily_present_root(year=opts.year, day=opts.day) / "input.txt"]
+    if scale:
+        if (opts.year, opts.day) not in YEAR_DAY_TO_GENERATOR:
+            raise typer.BadParameter(f"No input generator for {opts.year}/{opts.day:02d}")
+        input_paths = [
+            generate_input(year=opts.year, day=opts.day, size=size) for size in sorted(set(scale))
+        ]
+
+    langs = list(dict.fromkeys([opts.lang, *(versus or ())]))
+    stats: list[BenchStats] = []
+    with WorkerPool() as pool:
+        for lang in langs:
+            if not get_daily_solution_root(lang=lang, year=opts.year, day=opts.day).exists():
+                logger.warning(f"No {lang.value} solution for {opts.year}/{opts.day:02d}")
+                continue
+            bench = functools.partial(
+                bench_puzzle,
+                lang=lang,
+                year=opts.year,
+                day=opts.day,
+                repeat=repeat,
+                warmup=warmup,
+                in_process=in_process,
+            )
+            for input_path in input_paths:
+                if not scale:
+                    stats.extend(bench(part=part, input_path=input_path, pool=pool))
+                    continue
+                # NOTE: Max RSS of a warm worker is a high-water mark of everything it has
+                # solved, so each size and part of a scaling run gets a fresh worker.
+                for part_ in resolve_parts(part):
+                    with WorkerPool() as fresh_pool:
+                        stats.extend(bench(part=part_, input_path=input_path, pool=fresh_pool))
+
+    typer.echo(format_scaling(stats) if scale else format_bench_stats(stats))
+
+    revision = get_git_revision()
+    records = [
+        make_bench_record(
+            item,
+            year=opts.year,
+            day=opts.day,
+            in_process=in_process,
+            revision=revision,
+        )
+        for item in stats
+    ]
+    history = load_records()
+    if save:
+        append_records(records)
+        logger.info(f"Saved {len(records)} records to {BENCH_HISTORY_PATH}")
+
+    if compare:
+        comparisons = [
+            (record, find_baseline(record, history, revision=baseline)) for record in records
+        ]
+        typer.echo(format_comparisons(comparisons, threshold=threshold))
+        if any(
+            is_regression(record, baseline_record, threshold=threshold)
+            for record, baseline_record in comparisons
+        ):
+            raise typer.Exit(1)
+
+
+def bench_puzzle(
+    *,
+    lang: Lang,
+    year: int,
+    day: int,
+    part: int | None,
+    input_path: Path,
+    repeat: int,
+    warmup: int,
+    in_process: bool,
+    pool: WorkerPool | None,
+) -> list[BenchStats]:
+    build_puzzle(lang=lang, year=year, day=day)
+
+    stats: list[BenchStats] = []
+    for part_ in resolve_parts(part):
+        samples: list[float] = []
+        max_rss_kb = 0
+        for run_idx in range(warmup + repeat):
+            parsed_solutions = solve_puzzle(
+                lang=lang,
+                year=year,
+                day=day,
+                part=part_,
+                input_path=input_path,
+                suppress_stdout=True,
+                in_process=in_process,
+                pool=pool,
+                build=False,
+            )
+            if (
+                len(parsed_solutions) != 1
+                or (metrics := parsed_solutions[0].get("metrics")) is None
+            ):
+                raise RuntimeError(f"Part {part_} of {lang.value} solution produced no answer")
+            if run_idx < warmup:
+                continue
+            # NOTE: Parse stage is a part of solving, even though it is shared between parts.
+            samples.append(metrics["wall_s"] + (metrics["parse_s"] or 0.0))
+            max_rss_kb = max(max_rss_kb, metrics["max_rss_kb"])
+
+        stats.append(
+            BenchStats.from_samples(
+                lang=lang,
+                part=part_,
+                input_path=input_path,
+                samples=samples,
+                max_rss_kb=max_rss_kb,
+            )
+        )
+        logger.info(f"Benchmarked part {part_} of {lang.value} solution: {stats[-1]}")
+
+    return stats
+
+
+def make_bench_record(
+    stats: BenchStats,
+    /,
+    *,
+    year: int,
+    day: int,
+    in_process: bool,
+    revision: str,
+) -> BenchRecord:
+    return {
+        "year": year,
+        "day": day,
+        "lang": stats.lang.value,
+        "part": stats.part,
+        # NOTE: Only Python can run in-process, others are always external processes.
+        "mode": "in-process" if in_process and stats.lang is Lang.PYTHON else "subprocess",
+        "engine": resolve_engine(stats.lang),
+        "input": str(
+            stats.input_path.relative_to(ROOT)
+            if stats.input_path.is_relative_to(ROOT)
+            else stats.input_path
+        ),
+        "revision": revision,
+        "timestamp": time.time(),
+        "runs": stats.runs,
+        "min_s": stats.min_s,
+        "median_s": stats.median_s,
+        "p95_s": stats.p95_s,
+        "stddev_s": stats.stddev_s,
+        "max_rss_kb": stats.max_rss_kb,
+    }
+
+
+def is_regression(
+    record: BenchRecord, baseline: BenchRecord | None, /, *, threshold: float
+) -> bool:
+    return baseline is not None and record["median_s"] > baseline["median_s"] * (1 + threshold)
+
+
+def format_comparisons(
+    comparisons: Sequence[tuple[BenchRecord, BenchRecord | None]], /, *, threshold: float
+) -> str:
+    rows: list[tuple[str, ...]] = []
+    for record, baseline in comparisons:
+        if baseline is None:
+            rows.append(
+                (
+                    str(record["part"]),
+                    record["lang"],
+                    "-",
+                    "-",
+                    format_seconds(record["median_s"]),
+                    "-",
+                    "NO BASELINE",
+                )
+            )
+            continue
+        delta = record["median_s"] / baseline["median_s"] - 1 if baseline["median_s"] else 0.0
+        rows.append(
+            (
+                str(record["part"]),
+                record["lang"],
+                baseline["revision"][:12],
+                format_seconds(baseline["median_s"]),
+                format_seconds(record["median_s"]),
+                f"{delta:+.1%}",
+                "REGRESSED" if is_regression(record, baseline, threshold=threshold) else "OK",
+            )
+        )
+    return format_table(
+        ("PART", "LANG", "BASELINE", "BASE MEDIAN", "MEDIAN", "DELTA", "STATUS"), rows
+    )
+
+
+def format_bench_stats(stats: Sequence[BenchStats], /) -> str:
+    return format_table(
+        ("PART", "LANG", "RUNS", "MIN", "MEDIAN", "P95", "STDDEV", "MAX RSS"),
+        [
+            (
+                str(item.part),
+                item.lang.value,
+                str(item.runs),
+                format_seconds(item.min_s),
+                format_seconds(item.median_s),
+                format_seconds(item.p95_s),
+                format_seconds(item.stddev_s),
+                f"{item.max_rss_kb / 1024:.1f}MiB",
+            )
+            for item in sorted(stats, key=lambda item: (item.part, item.median_s))
+        ],
+    )
+
+
+def format_scaling(stats: Sequence[BenchStats], /) -> str:
+    """Table of time and memory against input size.
+
+    Exponent is a slope of median time against input size on log-log scale relative to
+    the previous size, e.g. 1 for linear solutions and 2 for quadratic ones.
+    """
+    rows: list[tuple[str, ...]] = []
+    prev: BenchStats | None = None
+    for item in sorted(stats, key=lambda item: (item.part, item.lang, item.input_size)):
+        exponent = "-"
+        if (
+            prev is not None
+            and (prev.part, prev.lang) == (item.part, item.lang)
+            and prev.input_size < item.input_size
+            and prev.median_s > 0
+        ):
+            time_growth = math.log(item.median_s / prev.median_s)
+            exponent = f"{time_growth / math.log(item.input_size / prev.input_size):.2f}"
+        rows.append(
+            (
+                str(item.part),
+                item.lang.value,
+                f"{item.input_size / (1 << 20):.1f}MiB",
+                format_seconds(item.median_s),
+                f"{item.input_size / (1 << 20) / item.median_s:.1f}MiB/s" if item.median_s else "-",
+                exponent,
+                f"{item.max_rss_kb / 1024:.1f}MiB",
+            )
+        )
+        prev = item
+    return format_table(
+        ("PART", "LANG", "INPUT", "MEDIAN", "THROUGHPUT", "EXPONENT", "MAX RSS"), rows
+    )
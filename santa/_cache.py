@@ -0,0 +1,93 @@
+import functools
+import os
+import tempfile
+from pathlib import Path
+
+from loguru import logger
+
+from ._defs import CACHE_ROOT
+from ._langs import Lang
+from ._utils import (
+    get_daily_solution_root,
+    get_elf_root,
+    get_lang_path,
+    hash_files,
+    iter_source_files,
+    resolve_engine,
+)
+
+
+class AnswerCache:
+    """Content-addressed on-disk store of puzzle answers.
+
+    Key covers solution sources of the day, the `elf` library and top-level toolchain
+    files of the language, the engine, the input file and the part. So any change to
+    what may affect an answer produces a new key and stale entries are simply never hit
+    again. Least recently used entries are evicted once there are more than `max_entries`.
+    """
+
+    def __init__(self, *, root: Path = CACHE_ROOT, max_entries: int = 4096) -> None:
+        assert max_entries > 0, f"Max entries must be positive: {max_entries}"
+        self._root = root
+        self._max_entries = max_entries
+
+    def make_key(self, *, lang: Lang, year: int, day: int, part: int, input_path: Path) -> str:
+        return hash_files(
+            [input_path],
+            names=False,
+            extra=(
+                lang.value,
+                resolve_engine(lang),
+                str(part),
+                self._hash_solution(lang=lang, year=year, day=day),
+            ),
+        )
+
+    def get(self, key: str, /) -> str | None:
+        path = self._resolve_path(key)
+        try:
+            answer = path.read_text()
+        except FileNotFoundError:
+            return None
+        # NOTE: Touch entry to mark it as recently used.
+        path.touch()
+        return answer
+
+    def put(self, key: str, answer: str, /) -> None:
+        path = self._resolve_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # NOTE: Write and rename so concurrent readers never observe a partial entry.
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{key}.")
+        with os.fdopen(fd, "w") as f:
+            f.write(answer)
+        Path(tmp_path).replace(path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = list(self._root.glob("*/*.txt"))
+        if (n_extra := len(entries) - self._max_entries) <= 0:
+            return
+
+        def mtime(path: Path) -> float:
+            try:
+                return path.stat().st_mtime
+            except FileNotFoundError:
+                return float("inf")
+
+        entries.sort(key=mtime)
+        for path in entries[:n_extra]:
+            path.unlink(missing_ok=True)
+        logger.debug(f"Evicted {n_extra} cached answers")
+
+    def _resolve_path(self, key: str, /) -> Path:
+        return self._root.joinpath(key[:2], f"{key}.txt")
+
+    @functools.cache  # noqa: B019
+    def _hash_solution(self, *, lang: Lang, year: int, day: int) -> str:
+        return hash_files(
+            [
+                *iter_source_files(get_lang_path(lang), recursive=False),
+                *iter_source_files(get_elf_root(lang)),
+                *iter_source_files(get_daily_solution_root(lang=lang, year=year, day=day)),
+            ]
+        )
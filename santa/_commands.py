@@ -10,9 +10,16 @@ from typing import ClassVar, Protocol, TypedDict
 
 import tomli_w
 
-from ._defs import ROOT, SOLUTIONS_ROOT
+from ._defs import BUILD_ROOT, ROOT, SOLUTIONS_ROOT
 from ._langs import LANG_TO_FILE_EXT, Lang
-from ._utils import get_daily_solution_root, get_event_root
+from ._utils import (
+    get_daily_build_root,
+    get_daily_solution_root,
+    get_elf_root,
+    get_event_root,
+    hash_files,
+    iter_source_files,
+)
 
 TEMPLATE_PREFIX = "template"
 
@@ -27,6 +34,10 @@ class PopenBuildOptsCtor(Protocol):
     def __call__(self, *, year: int, day: int) -> PopenOpts: ...
 
 
+class BuildArtifactCtor(Protocol):
+    def __call__(self, *, year: int, day: int) -> Path: ...
+
+
 class PopenSolveOptsCtor(Protocol):
     def __call__(self, *, year: int, day: int, part: int | None, input_path: Path) -> PopenOpts: ...
 
@@ -43,6 +54,7 @@ class Command:
 
     day_initializer: DayInitializer
     build_popen_opts_ctor: PopenBuildOptsCtor | None
+    build_artifact_ctor: BuildArtifactCtor | None = None
     solve_popen_opts_ctor: PopenSolveOptsCtor
 
     def resolve_build_popen_opts(self, *, year: int, day: int) -> PopenOpts:
@@ -50,11 +62,29 @@ class Command:
         opts = self.build_popen_opts_ctor(year=year, day=day)
         return self._extend_opts_with_pixi_extras(opts)
 
+    def resolve_build_artifact(self, *, year: int, day: int) -> Path | None:
+        """Path where build puts its output. Build is skipped when it already exists."""
+        if self.build_artifact_ctor is None:
+            return None
+        return self.build_artifact_ctor(year=year, day=day)
+
     def resolve_solve_popen_opts(
-        self, *, year: int, day: int, part: int | None, input_path: Path
+        self,
+        *,
+        year: int,
+        day: int,
+        part: int | None,
+        input_path: Path,
+        launcher: Sequence[str] = (),
     ) -> PopenOpts:
+        """Solve command, optionally run by `launcher` within the toolchain environment."""
         opts = self.solve_popen_opts_ctor(year=year, day=day, part=part, input_path=input_path)
-        return self._extend_opts_with_pixi_extras(opts)
+        launched_opts: PopenOpts = {
+            "cmd": [*launcher, *opts["cmd"]],
+            "env": opts["env"],
+            "cwd": opts["cwd"],
+        }
+        return self._extend_opts_with_pixi_extras(launched_opts)
 
     def _extend_opts_with_pixi_extras(self, opts: PopenOpts, /) -> PopenOpts:
         pixi_extra_cmd_parts = ["pixi", "-q", "run"]
@@ -98,19 +128,46 @@ def python_day_initializer(*, year: int, day: int) -> Path:
 # =====
 
 
-def construct_golang_solve_popen_opts(
-    *, year: int, day: int, part: int | None, input_path: Path
-) -> PopenOpts:
+def construct_golang_build_popen_opts(*, year: int, day: int) -> PopenOpts:
     lang = Lang.GOLANG
     daily_root = get_daily_solution_root(lang=lang, year=year, day=day)
     main_path = daily_root.joinpath(f"main{LANG_TO_FILE_EXT[lang]}")
+    executable_path = resolve_golang_build_artifact(year=year, day=day)
+    executable_path.parent.mkdir(parents=True, exist_ok=True)
     return {
-        "cmd": ["go", "run", str(main_path), *(_resolve_solve_input_args(part, input_path))],
+        "cmd": ["go", "build", "-o", str(executable_path), str(main_path)],
         "env": None,
         "cwd": SOLUTIONS_ROOT / lang.value,
     }
 
 
+def resolve_golang_build_artifact(*, year: int, day: int) -> Path:
+    lang = Lang.GOLANG
+    return _resolve_build_artifact(
+        lang=lang,
+        year=year,
+        day=day,
+        sources=[
+            *iter_source_files(SOLUTIONS_ROOT / lang.value, recursive=False),
+            *iter_source_files(get_elf_root(lang)),
+            *iter_source_files(get_daily_solution_root(lang=lang, year=year, day=day)),
+        ],
+    )
+
+
+def construct_golang_solve_popen_opts(
+    *, year: int, day: int, part: int | None, input_path: Path
+) -> PopenOpts:
+    return {
+        "cmd": [
+            str(resolve_golang_build_artifact(year=year, day=day)),
+            *(_resolve_solve_input_args(part, input_path)),
+        ],
+        "env": None,
+        "cwd": SOLUTIONS_ROOT / Lang.GOLANG.value,
+    }
+
+
 def golang_day_initializer(*, year: int, day: int) -> Path:
     return _simple_main_template_day_initializer(lang=Lang.GOLANG, year=year, day=day)
 
@@ -133,12 +190,14 @@ def construct_cpp_build_popen_opts(*, year: int, day: int) -> PopenOpts:
     lang = Lang.CPP
     daily_root = get_daily_solution_root(lang=lang, year=year, day=day)
     main_path = daily_root.joinpath(f"main{LANG_TO_FILE_EXT[lang]}")
+    executable_path = resolve_cpp_build_artifact(year=year, day=day)
+    executable_path.parent.mkdir(parents=True, exist_ok=True)
     return {
         "cmd": [
             "clang++",
             *parse_compile_flags(SOLUTIONS_ROOT / lang.value),
             "-o",
-            Command.EXECUTABLE_NAME,
+            str(executable_path),
             str(main_path),
         ],
         "env": None,
@@ -146,13 +205,28 @@ def construct_cpp_build_popen_opts(*, year: int, day: int) -> PopenOpts:
     }
 
 
+def resolve_cpp_build_artifact(*, year: int, day: int) -> Path:
+    lang = Lang.CPP
+    return _resolve_build_artifact(
+        lang=lang,
+        year=year,
+        day=day,
+        sources=[
+            SOLUTIONS_ROOT.joinpath(lang.value, "compile_flags.txt"),
+            *iter_source_files(get_elf_root(lang)),
+            *iter_source_files(get_daily_solution_root(lang=lang, year=year, day=day)),
+        ],
+    )
+
+
 def construct_cpp_solve_popen_opts(
     *, year: int, day: int, part: int | None, input_path: Path
 ) -> PopenOpts:
-    _ = year
-    _ = day
     return {
-        "cmd": [f"./{Command.EXECUTABLE_NAME}", *(_resolve_solve_input_args(part, input_path))],
+        "cmd": [
+            str(resolve_cpp_build_artifact(year=year, day=day)),
+            *(_resolve_solve_input_args(part, input_path)),
+        ],
         "env": None,
         "cwd": SOLUTIONS_ROOT / Lang.CPP.value,
     }
@@ -167,21 +241,54 @@ def cpp_day_initializer(*, year: int, day: int) -> Path:
 # =====
 
 
+def construct_rust_build_popen_opts(*, year: int, day: int) -> PopenOpts:
+    lang = Lang.RUST
+    executable_path = resolve_rust_build_artifact(year=year, day=day)
+    # NOTE: `cargo install` puts executable into `<root>/bin`. Target directory is shared by
+    # all days, so common dependencies like `elf` are compiled only once.
+    install_root = executable_path.parent.parent
+    return {
+        "cmd": [
+            "cargo",
+            "install",
+            "--quiet",
+            "--force",
+            "--path",
+            ".",
+            "--root",
+            str(install_root),
+            "--target-dir",
+            str(BUILD_ROOT.joinpath(lang.value, "target")),
+        ],
+        "env": None,
+        "cwd": get_daily_solution_root(lang=lang, year=year, day=day),
+    }
+
+
+def resolve_rust_build_artifact(*, year: int, day: int) -> Path:
+    lang = Lang.RUST
+    daily_root = get_daily_solution_root(lang=lang, year=year, day=day)
+    package_name = tomllib.loads(daily_root.joinpath("Cargo.toml").read_text())["package"]["name"]
+    return _resolve_build_artifact(
+        lang=lang,
+        year=year,
+        day=day,
+        sources=[*iter_source_files(get_elf_root(lang)), *iter_source_files(daily_root)],
+        name=f"bin/{package_name}",
+    )
+
+
 def construct_rust_solve_popen_opts(
     *, year: int, day: int, part: int | None, input_path: Path
 ) -> PopenOpts:
     lang = Lang.RUST
-    daily_root = get_daily_solution_root(lang=lang, year=year, day=day)
     return {
         "cmd": [
-            "cargo",
-            "run",
-            "--release",
-            "--",
+            str(resolve_rust_build_artifact(year=year, day=day)),
             *(_resolve_solve_input_args(part, input_path)),
         ],
         "env": None,
-        "cwd": daily_root,
+        "cwd": get_daily_solution_root(lang=lang, year=year, day=day),
     }
 
 
@@ -213,19 +320,22 @@ COMMANDS = (
     Command(
         lang=Lang.GOLANG,
         day_initializer=golang_day_initializer,
-        build_popen_opts_ctor=None,
+        build_popen_opts_ctor=construct_golang_build_popen_opts,
+        build_artifact_ctor=resolve_golang_build_artifact,
         solve_popen_opts_ctor=construct_golang_solve_popen_opts,
     ),
     Command(
         lang=Lang.CPP,
         day_initializer=cpp_day_initializer,
         build_popen_opts_ctor=construct_cpp_build_popen_opts,
+        build_artifact_ctor=resolve_cpp_build_artifact,
         solve_popen_opts_ctor=construct_cpp_solve_popen_opts,
     ),
     Command(
         lang=Lang.RUST,
         day_initializer=rust_day_initializer,
-        build_popen_opts_ctor=None,
+        build_popen_opts_ctor=construct_rust_build_popen_opts,
+        build_artifact_ctor=resolve_rust_build_artifact,
         solve_popen_opts_ctor=construct_rust_solve_popen_opts,
     ),
 )
@@ -240,6 +350,15 @@ def _resolve_solve_input_args(part: int | None, input_path: Path) -> Sequence[st
     return out
 
 
+def _resolve_build_artifact(
+    *, lang: Lang, year: int, day: int, sources: Sequence[Path], name: str = Command.EXECUTABLE_NAME
+) -> Path:
+    # NOTE: Every source revision gets its own directory, so builds of different days or
+    # revisions never overwrite an executable that may be running right now.
+    digest = hash_files(sources)[:16]
+    return get_daily_build_root(lang=lang, year=year, day=day).joinpath(digest, name)
+
+
 def _simple_main_template_day_initializer(*, lang: Lang, year: int, day: int) -> Path:
     template_path = get_event_root(lang) / f"{TEMPLATE_PREFIX}{LANG_TO_FILE_EXT[lang]}"
     if not template_path.exists():
@@ -6,3 +6,21 @@ ROOT = Path(__file__).absolute().parent.parent
 SOLUTIONS_ROOT = ROOT / "workshop"
 
 PRESENTS_ROOT = ROOT / "presents"
+
+# Local state of santa itself: caches, build artifacts, etc. Never committed.
+SANTA_ROOT = ROOT / ".santa"
+
+CACHE_ROOT = SANTA_ROOT / "cache"
+
+BUILD_ROOT = SANTA_ROOT / "build"
+
+BENCH_HISTORY_PATH = SANTA_ROOT / "bench-history.jsonl"
+
+PROFILES_ROOT = SANTA_ROOT / "profiles"
+
+INPUTS_ROOT = SANTA_ROOT / "inputs"
+
+# Solutions may implement alternative engines, which are selected with this variable.
+ENGINE_ENV = "ELF_ENGINE"
+
+DEFAULT_ENGINE = "python"
@@ -0,0 +1,329 @@
+import functools
+import itertools
+import math
+import random
+import re
+import string
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Annotated
+
+import typer
+from loguru import logger
+
+from ._defs import INPUTS_ROOT
+
+type InputGenerator = Callable[[random.Random, int], Iterator[str]]
+
+YEAR_DAY_TO_GENERATOR: dict[tuple[int, int], InputGenerator] = {}
+
+SIZE_RE = re.compile(r"(?P<value>\d+)\s*(?P<unit>[KMG]?)(?:I?B)?", re.IGNORECASE)
+UNIT_TO_MULTIPLIER = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+DIGITS_TABLE = bytes(ord("0") + byte % 10 for byte in range(256))
+XMAS_TABLE = bytes(ord("XMAS"[byte % 4]) for byte in range(256))
+# NOTE: Roughly one obstacle per 21 cells, which is the density of real inputs.
+GUARD_GRID_TABLE = bytes(ord("#") if byte < 12 else ord(".") for byte in range(256))
+
+SPELLED_DIGITS = ("one", "two", "three", "four", "five", "six", "seven", "eight", "nine")
+
+
+def parse_size(value: str, /) -> int:
+    if (match := SIZE_RE.fullmatch(value.strip())) is None:
+        raise typer.BadParameter(f"Invalid size: {value}")
+    return int(match["value"]) * UNIT_TO_MULTIPLIER[match["unit"].upper()]
+
+
+def format_size(size: int, /) -> str:
+    for unit, multiplier in sorted(UNIT_TO_MULTIPLIER.items(), key=lambda item: -item[1]):
+        if size % multiplier == 0:
+            return f"{size // multiplier}{unit}B"
+    raise AssertionError("unreachable")
+
+
+def generate_handler(
+    *,
+    year: Annotated[
+        int,
+        typer.Option("-y", "--year", help="Contest year"),
+    ],
+    day: Annotated[
+        int,
+        typer.Option("-d", "--day", help="Contest day"),
+    ],
+    sizes: Annotated[
+        list[int],
+        typer.Option(
+            "-s",
+            "--size",
+            help="Approximate input size, e.g. 1MB, 100MB or 1GB",
+            parser=parse_size,
+            metavar="SIZE",
+        ),
+    ],
+    seed: Annotated[
+        int,
+        typer.Option(help="Seed of random generator"),
+    ] = 0,
+    force: Annotated[
+        bool,
+        typer.Option("--force", help="Regenerate inputs even if they exist"),
+    ] = False,
+) -> None:
+    if (year, day) not in YEAR_DAY_TO_GENERATOR:
+        raise typer.BadParameter(f"No input generator for {year}/{day:02d}")
+
+    for size in sizes:
+        typer.echo(generate_input(year=year, day=day, size=size, seed=seed, force=force))
+
+
+def register(*, year: int, day: int) -> Callable[[InputGenerator], InputGenerator]:
+    def decorator(generator: InputGenerator, /) -> InputGenerator:
+        assert (year, day) not in YEAR_DAY_TO_GENERATOR, f"Duplicated generator: {year}/{day}"
+        YEAR_DAY_TO_GENERATOR[(year, day)] = generator
+        return generator
+
+    return decorator
+
+
+def get_generated_input_path(*, year: int, day: int, size: int, seed: int) -> Path:
+    return INPUTS_ROOT.joinpath(f"y{year}", f"d{day:02d}", f"{format_size(size)}-s{seed}.txt")
+
+
+def generate_input(*, year: int, day: int, size: int, seed: int = 0, force: bool = False) -> Path:
+    """Write input of roughly `size` bytes unless it exists and return its path.
+
+    Inputs are streamed to disk line by line, so even gigabyte inputs take little memory.
+    The same seed always produces the same input.
+    """
+    path = get_generated_input_path(year=year, day=day, size=size, seed=seed)
+    if path.exists() and not force:
+        logger.info(f"Input is up to date: {path}")
+        return path
+
+    generator = YEAR_DAY_TO_GENERATOR[(year, day)]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Generating {format_size(size)} input for {year}/{day:02d} ...")
+    # NOTE: Written to temporary file first, so interrupted generation leaves no partial input.
+    with tempfile.NamedTemporaryFile(
+        "w", dir=path.parent, prefix=f".{path.name}.", delete=False
+    ) as f:
+        f.writelines(f"{line}\n" for line in generator(random.Random(seed), size))
+    Path(f.name).replace(path)
+    logger.info(f"Generated {path.stat().st_size} bytes: {path}")
+    return path
+
+
+def take_bytes(lines: Iterable[str], size: int, /) -> Iterator[str]:
+    """Take lines until they fill `size` bytes, newlines included."""
+    written = 0
+    for line in lines:
+        if written >= size:
+            break
+        written += len(line) + 1
+        yield line
+
+
+def get_grid_side(size: int, /) -> int:
+    # NOTE: Square grid of side `n` takes `n * (n + 1)` bytes with newlines.
+    return max(4, math.isqrt(size))
+
+
+def make_word(rng: random.Random, /, *, min_len: int, max_len: int) -> str:
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(min_len, max_len)))
+
+
+@register(year=2022, day=1)
+def generate_calories(rng: random.Random, size: int, /) -> Iterator[str]:
+    def iter_lines() -> Iterator[str]:
+        while True:
+            for _ in range(rng.randint(1, 15)):
+                yield str(rng.randint(1_000, 60_000))
+            yield ""
+
+    return take_bytes(iter_lines(), size)
+
+
+@register(year=2022, day=7)
+def generate_shell_transcript(rng: random.Random, size: int, /) -> Iterator[str]:
+    max_depth = 8
+
+    def iter_directory(*, depth: int, n_dirs: int) -> Iterator[str]:
+        dirs = list(dict.fromkeys(make_word(rng, min_len=3, max_len=8) for _ in range(n_dirs)))
+        files = {make_word(rng, min_len=3, max_len=8) for _ in range(rng.randint(0, 8))}
+        yield "$ ls"
+        for name in dirs:
+            yield f"dir {name}"
+        for name in files:
+            yield f"{rng.randint(1_000, 300_000)} {name}.{make_word(rng, min_len=1, max_len=3)}"
+        if depth == max_depth:
+            return
+        for name in dirs:
+            yield f"$ cd {name}"
+            yield from iter_directory(depth=depth + 1, n_dirs=rng.randint(0, 4))
+            yield "$ cd .."
+
+    # NOTE: Root is wide enough to fill the input, deeper levels stay small.
+    lines = itertools.chain(("$ cd /",), iter_directory(depth=0, n_dirs=size // 4096 + 1))
+    return take_bytes(lines, size)
+
+
+@register(year=2022, day=8)
+def generate_forest(rng: random.Random, size: int, /) -> Iterator[str]:
+    side = get_grid_side(size)
+    for _ in range(side):
+        yield rng.randbytes(side).translate(DIGITS_TABLE).decode()
+
+
+@register(year=2022, day=9)
+def generate_rope_moves(rng: random.Random, size: int, /) -> Iterator[str]:
+    lines = (f"{rng.choice('RLUD')} {rng.randint(1, 20)}" for _ in itertools.count())
+    return take_bytes(lines, size)
+
+
+@register(year=2022, day=10)
+def generate_cpu_program(rng: random.Random, size: int, /) -> Iterator[str]:
+    def iter_lines() -> Iterator[str]:
+        # NOTE: Register stays within CRT width, as it does in real inputs.
+        x = 1
+        while True:
+            if rng.random() < 0.3:
+                yield "noop"
+                continue
+            value = rng.randint(max(-20, -x), min(20, 39 - x))
+            x += value
+            yield f"addx {value}"
+
+    return take_bytes(iter_lines(), size)
+
+
+@register(year=2023, day=1)
+def generate_calibration_document(rng: random.Random, size: int, /) -> Iterator[str]:
+    def make_line() -> str:
+        tokens = [str(rng.randint(1, 9))]
+        for _ in range(rng.randint(1, 6)):
+            match rng.randint(0, 2):
+                case 0:
+                    tokens.append(str(rng.randint(1, 9)))
+                case 1:
+                    tokens.append(rng.choice(SPELLED_DIGITS))
+                case _:
+                    tokens.append(make_word(rng, min_len=1, max_len=5))
+        rng.shuffle(tokens)
+        return "".join(tokens)
+
+    return take_bytes((make_line() for _ in itertools.count()), size)
+
+
+@register(year=2024, day=1)
+def generate_location_pairs(rng: random.Random, size: int, /) -> Iterator[str]:
+    lines = (
+        f"{rng.randint(10_000, 99_999)}   {rng.randint(10_000, 99_999)}" for _ in itertools.count()
+    )
+    return take_bytes(lines, size)
+
+
+@register(year=2024, day=2)
+def generate_reports(rng: random.Random, size: int, /) -> Iterator[str]:
+    def make_line() -> str:
+        direction = rng.choice((-1, 1))
+        levels = [rng.randint(30, 60)]
+        for _ in range(rng.randint(4, 7)):
+            # NOTE: Mostly safe steps with occasional violations.
+            step = rng.randint(1, 3) if rng.random() < 0.9 else rng.randint(-2, 6)
+            levels.append(levels[-1] + direction * step)
+        return " ".join(map(str, levels))
+
+    return take_bytes((make_line() for _ in itertools.count()), size)
+
+
+@register(year=2024, day=3)
+def generate_corrupted_memory(rng: random.Random, size: int, /) -> Iterator[str]:
+    def make_token() -> str:
+        match rng.randint(0, 9):
+            case 0:
+                return rng.choice(("do()", "don't()"))
+            case 1 | 2 | 3:
+                return f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})"
+            case 4:
+                return f"{rng.choice(('mul', 'what', 'from', 'who'))}({rng.randint(1, 999)}]"
+            case _:
+                return "".join(rng.choices(string.punctuation + " ", k=rng.randint(1, 6)))
+
+    def make_line() -> str:
+        return "".join(make_token() for _ in range(400))
+
+    return take_bytes((make_line() for _ in itertools.count()), size)
+
+
+@register(year=2024, day=4)
+def generate_word_search(rng: random.Random, size: int, /) -> Iterator[str]:
+    side = get_grid_side(size)
+    for _ in range(side):
+        yield rng.randbytes(side).translate(XMAS_TABLE).decode()
+
+
+@register(year=2024, day=5)
+def generate_print_queue(rng: random.Random, size: int, /) -> Iterator[str]:
+    # NOTE: Every pair of pages is ordered by rules, so every update can be fixed.
+    pages = list(range(10, 100))
+    rng.shuffle(pages)
+    rules = [
+        f"{pages[lhs_idx]}|{pages[rhs_idx]}"
+        for lhs_idx, rhs_idx in itertools.combinations(range(len(pages)), 2)
+    ]
+    rng.shuffle(rules)
+    yield from rules
+    yield ""
+
+    def make_line() -> str:
+        return ",".join(map(str, rng.sample(pages, k=rng.randrange(5, 24, 2))))
+
+    yield from take_bytes(
+        (make_line() for _ in itertools.count()), size - sum(len(rule) + 1 for rule in rules)
+    )
+
+
+@register(year=2024, day=6)
+def generate_guard_map(rng: random.Random, size: int, /) -> Iterator[str]:
+    side = get_grid_side(size)
+    row_seed = rng.getrandbits(64)
+
+    # NOTE: Rows are regenerated on demand, so the map is never held in memory as a whole.
+    @functools.lru_cache(maxsize=1024)
+    def get_row(y: int, /) -> bytes:
+        return random.Random(row_seed + y).randbytes(side).translate(GUARD_GRID_TABLE)
+
+    def escapes(x: int, y: int, /) -> bool:
+        dx, dy = 0, -1
+        turns: set[tuple[int, int, int, int]] = set()
+        for _ in range(16 * side):
+            next_x, next_y = x + dx, y + dy
+            if not (0 <= next_x < side and 0 <= next_y < side):
+                return True
+            if get_row(next_y)[next_x] != ord("#"):
+                x, y = next_x, next_y
+                continue
+            if (x, y, dx, dy) in turns:
+                return False
+            turns.add((x, y, dx, dy))
+            dx, dy = -dy, dx
+        return False
+
+    # NOTE: Guard must leave the map, so starts are retried until one escapes. As a last
+    # resort the column above the start is cleared, which guarantees an escape.
+    start_x, start_y, clear_above = 0, 0, True
+    for _ in range(100):
+        start_x, start_y = rng.randrange(side), rng.randrange(side)
+        if get_row(start_y)[start_x] != ord("#") and escapes(start_x, start_y):
+            clear_above = False
+            break
+
+    for y in range(side):
+        row = bytearray(get_row(y))
+        if y == start_y:
+            row[start_x] = ord("^")
+        elif y < start_y and clear_above:
+            row[start_x] = ord(".")
+        yield row.decode()
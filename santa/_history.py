@@ -0,0 +1,66 @@
+import json
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Literal, NotRequired, TypedDict
+
+from ._defs import BENCH_HISTORY_PATH, DEFAULT_ENGINE
+
+
+class BenchRecord(TypedDict):
+    year: int
+    day: int
+    lang: str
+    part: Literal[1, 2]
+    mode: Literal["in-process", "subprocess"]
+    # NOTE: Solution engine selected with `ELF_ENGINE`, missing in records made before it.
+    engine: NotRequired[str]
+    input: str
+    revision: str
+    timestamp: float
+    runs: int
+    min_s: float
+    median_s: float
+    p95_s: float
+    stddev_s: float
+    max_rss_kb: int
+
+
+def get_record_key(record: BenchRecord, /) -> tuple[int, int, str, int, str, str, str]:
+    """Records are comparable only if their keys are equal."""
+    return (
+        record["year"],
+        record["day"],
+        record["lang"],
+        record["part"],
+        record["mode"],
+        record.get("engine", DEFAULT_ENGINE),
+        record["input"],
+    )
+
+
+def load_records(path: Path = BENCH_HISTORY_PATH) -> list[BenchRecord]:
+    if not path.exists():
+        return []
+    with path.open() as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_records(records: Iterable[BenchRecord], path: Path = BENCH_HISTORY_PATH) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a") as f:
+        f.writelines(json.dumps(record) + "\n" for record in records)
+
+
+def find_baseline(
+    record: BenchRecord, history: Sequence[BenchRecord], /, *, revision: str | None = None
+) -> BenchRecord | None:
+    """Latest comparable record of `revision`, or of any other revision if it is not passed."""
+    key = get_record_key(record)
+    for candidate in sorted(history, key=lambda item: item["timestamp"], reverse=True):
+        if get_record_key(candidate) != key:
+            continue
+        if revision is None and candidate["revision"] != record["revision"]:
+            return candidate
+        if revision is not None and candidate["revision"].startswith(revision):
+            return candidate
+    return None
@@ -0,0 +1,118 @@
+import contextlib
+import importlib.util
+import io
+import sys
+import time
+from collections.abc import Iterator
+from contextlib import AbstractContextManager
+from pathlib import Path
+from types import MappingProxyType, ModuleType
+from typing import Literal, Protocol, TypedDict
+
+from ._langs import LANG_TO_FILE_EXT, Lang
+from ._metrics import RunMetrics, get_self_max_rss_kb
+from ._utils import get_daily_solution_root, get_lang_path, resolve_parts
+
+PART_TO_SOLVER_NAME = MappingProxyType({1: "solve_first_part", 2: "solve_second_part"})
+# NOTE: Optional stage, its result is computed once per run and handed to every solved part
+# instead of path.
+PARSER_NAME = "parse"
+
+
+class PartHook(Protocol):
+    """Context manager factory entered around each solved part, e.g. to profile it."""
+
+    def __call__(self, part: Literal[1, 2], /) -> AbstractContextManager[None]: ...
+
+
+class InProcessRun(TypedDict):
+    output: str
+    part_to_metrics: dict[int, RunMetrics]
+
+
+def run_python_solution(
+    *,
+    year: int,
+    day: int,
+    part: int | None,
+    input_path: Path,
+    part_hook: PartHook | None = None,
+) -> InProcessRun:
+    """Solve puzzle inside current interpreter and return everything solution printed.
+
+    If solution defines parse stage, input is parsed once within the hook of the first
+    solved part, and parsing time is reported separately for that part only.
+    """
+    lang = Lang.PYTHON
+    main_path = get_daily_solution_root(lang=lang, year=year, day=day).joinpath(
+        f"main{LANG_TO_FILE_EXT[lang]}"
+    )
+    if not main_path.exists():
+        raise FileNotFoundError(main_path)
+
+    stdout = io.StringIO()
+    part_to_metrics: dict[int, RunMetrics] = {}
+    with isolated_modules(get_lang_path(lang)), contextlib.redirect_stdout(stdout):
+        start = time.perf_counter()
+        module = load_module(main_path, name=f"aoc_y{year}_d{day:02d}")
+        startup_s = time.perf_counter() - start
+
+        parse = getattr(module, PARSER_NAME, None)
+        data: object = input_path
+        is_parsed = False
+        for part_ in resolve_parts(part):
+            parse_s: float | None = None
+            with part_hook(part_) if part_hook is not None else contextlib.nullcontext():
+                if parse is not None and not is_parsed:
+                    start = time.perf_counter()
+                    data = parse(input_path)
+                    parse_s = time.perf_counter() - start
+                    is_parsed = True
+                start, start_cpu = time.perf_counter(), time.process_time()
+                getattr(module, PART_TO_SOLVER_NAME[part_])(data)
+                wall_s, cpu_s = time.perf_counter() - start, time.process_time() - start_cpu
+            part_to_metrics[part_] = {
+                "build_s": 0.0,
+                "startup_s": startup_s,
+                "parse_s": parse_s,
+                "wall_s": wall_s,
+                "cpu_s": cpu_s,
+                # NOTE: This is a peak of the whole interpreter, including previous runs.
+                "max_rss_kb": get_self_max_rss_kb(),
+            }
+
+    return {"output": stdout.getvalue(), "part_to_metrics": part_to_metrics}
+
+
+def load_module(path: Path, /, *, name: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None and spec.loader is not None, f"Cannot load module from {path}"
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@contextlib.contextmanager
+def isolated_modules(root: Path, /) -> Iterator[None]:
+    """Make `root` importable and forget modules from `root` imported within the block.
+
+    Each run gets fresh copies of the solution and of `elf`, so module level state
+    never leaks between runs.
+    """
+    saved_path = sys.path.copy()
+    saved_modules = frozenset(sys.modules)
+    sys.path.insert(0, str(root))
+    try:
+        yield
+    finally:
+        sys.path[:] = saved_path
+        for name in sys.modules.keys() - saved_modules:
+            if _is_module_within(sys.modules[name], root):
+                del sys.modules[name]
+
+
+def _is_module_within(module: ModuleType, root: Path, /) -> bool:
+    # NOTE: Third-party and extension modules are kept, some of them cannot be imported twice.
+    filename = getattr(module, "__file__", None)
+    return filename is not None and Path(filename).is_relative_to(root)
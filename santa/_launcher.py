@@ -0,0 +1,35 @@
+"""Lean launcher of external solutions, which reports resource usage of the solution alone.
+
+Kernel carries peak RSS of a process over fork and exec, so any process spawned by santa
+reports at least the peak of santa itself. This script is run by toolchain wrapper in
+place of the solution, stays small and spawns the solution, whose peak RSS then starts
+from the footprint of the launcher. It writes a report line to `REPORT_PATH` with
+monotonic moments the launcher started and the solution exited, CPU seconds and max RSS
+of the solution. Only standard modules without heavy imports may be used here.
+
+Usage: python -I -S _launcher.py REPORT_PATH COMMAND [ARGS ...]
+"""
+
+import os
+import sys
+import time
+
+
+def main() -> int:
+    launched_at = time.monotonic()
+    report_path, *cmd = sys.argv[1:]
+    pid = os.posix_spawnp(cmd[0], cmd, os.environ)
+    _, status, rusage = os.wait4(pid, 0)
+    exited_at = time.monotonic()
+
+    fd = os.open(report_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        report = (launched_at, exited_at, rusage.ru_utime + rusage.ru_stime, rusage.ru_maxrss)
+        os.write(fd, " ".join(map(str, report)).encode())
+    finally:
+        os.close(fd)
+    return os.waitstatus_to_exitcode(status)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
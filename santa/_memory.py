@@ -0,0 +1,140 @@
+import contextlib
+import linecache
+import threading
+import tracemalloc
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+from ._defs import ROOT
+from ._metrics import format_table
+
+SANTA_PACKAGE_ROOT = Path(__file__).absolute().parent
+
+
+@dataclass(frozen=True, kw_only=True, slots=True)
+class AllocationSite:
+    filename: str
+    lineno: int
+    size_kb: float
+    count: int
+
+
+@dataclass(kw_only=True, slots=True)
+class PartMemory:
+    part: Literal[1, 2]
+    peak_kb: float
+    # NOTE: Sites are taken from the largest snapshot, which may be slightly below the peak.
+    snapshot_kb: float
+    top_sites: list[AllocationSite]
+
+
+class MemoryTracer:
+    """Part hook that traces Python allocations of in-process solution with tracemalloc.
+
+    Allocations are released once a part returns, so top allocation sites are captured
+    by a watcher thread, which takes a snapshot whenever traced memory grows noticeably.
+    """
+
+    def __init__(
+        self, *, interval: float = 0.005, growth: float = 1.1, n_top_sites: int = 10
+    ) -> None:
+        self.interval = interval
+        self.growth = growth
+        self.n_top_sites = n_top_sites
+        self.memories: list[PartMemory] = []
+
+    @contextlib.contextmanager
+    def __call__(self, part: Literal[1, 2], /) -> Iterator[None]:
+        tracemalloc.start()
+        watcher = SnapshotWatcher(interval=self.interval, growth=self.growth)
+        watcher.start()
+        try:
+            yield
+        finally:
+            watcher.stop()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+        snapshot_kb, top_sites = 0.0, []
+        if watcher.snapshot is not None:
+            snapshot_kb = watcher.snapshot_size / 1024
+            top_sites = get_top_sites(watcher.snapshot, self.n_top_sites)
+        self.memories.append(
+            PartMemory(part=part, peak_kb=peak / 1024, snapshot_kb=snapshot_kb, top_sites=top_sites)
+        )
+
+
+class SnapshotWatcher:
+    def __init__(self, *, interval: float, growth: float) -> None:
+        self.interval = interval
+        self.growth = growth
+        self.snapshot: tracemalloc.Snapshot | None = None
+        self.snapshot_size = 0
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            current, _ = tracemalloc.get_traced_memory()
+            if current > self.snapshot_size * self.growth:
+                self.snapshot, self.snapshot_size = tracemalloc.take_snapshot(), current
+
+
+def get_top_sites(snapshot: tracemalloc.Snapshot, n: int, /) -> list[AllocationSite]:
+    # NOTE: Allocations of santa itself and of the watcher thread are not interesting.
+    snapshot = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, threading.__file__),
+            tracemalloc.Filter(False, str(SANTA_PACKAGE_ROOT / "*")),
+        )
+    )
+    return [
+        AllocationSite(
+            filename=stat.traceback[0].filename,
+            lineno=stat.traceback[0].lineno,
+            size_kb=stat.size / 1024,
+            count=stat.count,
+        )
+        for stat in snapshot.statistics("lineno")[:n]
+    ]
+
+
+def format_site(site: AllocationSite, /) -> str:
+    path = Path(site.filename)
+    location = f"{path.relative_to(ROOT) if path.is_relative_to(ROOT) else path.name}:{site.lineno}"
+    if source := linecache.getline(site.filename, site.lineno).strip():
+        return f"{location}  {source}"
+    return location
+
+
+def format_part_memories(memories: Sequence[PartMemory], /) -> str:
+    sections: list[str] = []
+    for memory in memories:
+        if len(memory.top_sites) == 0:
+            sections.append(f"Part {memory.part} finished before any snapshot was taken")
+            continue
+        sections.append(
+            "\n".join(
+                (
+                    f"Part {memory.part} top allocation sites at {memory.snapshot_kb / 1024:.1f}MiB:",
+                    format_table(
+                        ("SIZE", "COUNT", "SITE"),
+                        [
+                            (f"{site.size_kb / 1024:.1f}MiB", str(site.count), format_site(site))
+                            for site in memory.top_sites
+                        ],
+                    ),
+                )
+            )
+        )
+    return "\n\n".join(sections)
@@ -0,0 +1,46 @@
+import resource
+import sys
+from collections.abc import Sequence
+from typing import TypedDict
+
+
+class RunMetrics(TypedDict):
+    """Resources spent on solving a single part.
+
+    `startup_s` is import time of the solution module for in-process runs, and for external
+    processes it is the time toolchain wrapper took to launch the solution, whose own
+    runtime startup cannot be told apart from solving. `parse_s` is time of the shared
+    parse stage of in-process runs, reported for the part which ran it, and `None` for
+    other parts and for external processes. When both parts are solved by one external
+    process, `cpu_s` and `max_rss_kb` describe the whole process and are the same for both
+    parts. External processes are measured by a lean launcher, so their `max_rss_kb` never
+    falls below the launcher footprint of a few megabytes.
+    """
+
+    build_s: float
+    startup_s: float | None
+    parse_s: float | None
+    wall_s: float
+    cpu_s: float
+    max_rss_kb: int
+
+
+def normalize_max_rss(ru_maxrss: int, /) -> int:
+    # NOTE: `ru_maxrss` is reported in bytes on macOS and in kilobytes on Linux.
+    return ru_maxrss // 1024 if sys.platform == "darwin" else ru_maxrss
+
+
+def get_self_max_rss_kb() -> int:
+    return normalize_max_rss(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def format_table(header: Sequence[str], rows: Sequence[Sequence[str]], /) -> str:
+    widths = [max(len(row[idx]) for row in (header, *rows)) for idx in range(len(header))]
+    return "\n".join(
+        "  ".join(cell.ljust(width) for cell, width in zip(row, widths, strict=True)).rstrip()
+        for row in (header, *rows)
+    )
+
+
+def format_seconds(seconds: float | None, /) -> str:
+    return "-" if seconds is None else f"{seconds:.3f}s"
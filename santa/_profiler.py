@@ -0,0 +1,252 @@
+import contextlib
+import cProfile
+import enum
+import pstats
+import sys
+import threading
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from types import FrameType
+from typing import Literal, assert_never
+
+from ._defs import PROFILES_ROOT, SOLUTIONS_ROOT
+from ._langs import Lang
+from ._metrics import format_table
+
+SANTA_PACKAGE_ROOT = str(Path(__file__).absolute().parent)
+SOLUTIONS_PREFIX = str(SOLUTIONS_ROOT)
+PROFILER_DISABLE_NAME = "<method 'disable' of '_lsprof.Profiler' objects>"
+
+# NOTE: Functions are identified by pstats as (filename, first line number, name).
+type Function = tuple[str, int, str]
+
+
+class ProfileMode(str, enum.Enum):
+    CPROFILE = "cprofile"
+    SAMPLE = "sample"
+
+
+@dataclass(kw_only=True, slots=True)
+class PartProfile:
+    part: Literal[1, 2]
+    mode: ProfileMode
+    path: Path
+    collapsed_path: Path
+    # NOTE: Pairs of function and its self time share.
+    hot_functions: list[tuple[str, float]]
+
+
+class SolutionProfiler:
+    """Part hook that profiles every part of in-process Python solution.
+
+    `cprofile` mode traces every call and dumps `.prof` file for pstats or snakeviz.
+    `sample` mode periodically captures call stacks, it is cheap enough to keep hot loops
+    undistorted. Both modes dump collapsed stacks for `flamegraph.pl` or speedscope.
+    """
+
+    def __init__(
+        self,
+        *,
+        mode: ProfileMode,
+        year: int,
+        day: int,
+        interval: float = 0.001,
+        n_hot_functions: int = 15,
+    ) -> None:
+        self.mode = mode
+        self.root = PROFILES_ROOT.joinpath(Lang.PYTHON.value, f"y{year}", f"d{day:02d}")
+        self.interval = interval
+        self.n_hot_functions = n_hot_functions
+        self.profiles: list[PartProfile] = []
+
+    @contextlib.contextmanager
+    def __call__(self, part: Literal[1, 2], /) -> Iterator[None]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        match self.mode:
+            case ProfileMode.CPROFILE:
+                profile = cProfile.Profile()
+                profile.enable()
+                try:
+                    yield
+                finally:
+                    profile.disable()
+                path = self.root / f"p{part}.prof"
+                profile.dump_stats(path)
+                stats = pstats.Stats(profile)
+                collapsed_path = write_collapsed_stacks(
+                    self.root / f"p{part}.collapsed", collapse_profile(stats)
+                )
+                hot_functions = get_hot_functions(stats, self.n_hot_functions)
+            case ProfileMode.SAMPLE:
+                sampler = StackSampler(thread_id=threading.get_ident(), interval=self.interval)
+                sampler.start()
+                try:
+                    yield
+                finally:
+                    sampler.stop()
+                path = collapsed_path = write_collapsed_stacks(
+                    self.root / f"p{part}.collapsed", sampler.stacks
+                )
+                hot_functions = sampler.get_hot_functions(self.n_hot_functions)
+            case _:
+                assert_never(self.mode)
+
+        self.profiles.append(
+            PartProfile(
+                part=part,
+                mode=self.mode,
+                path=path,
+                collapsed_path=collapsed_path,
+                hot_functions=hot_functions,
+            )
+        )
+
+
+class StackSampler:
+    """Periodically captures call stack of another thread.
+
+    Sampling rate is bounded by interpreter switch interval, since sampled thread holds
+    the GIL while running pure Python code.
+    """
+
+    def __init__(self, *, thread_id: int, interval: float) -> None:
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def get_hot_functions(self, n: int, /) -> list[tuple[str, float]]:
+        leaf_counts: Counter[str] = Counter()
+        for stack, count in self.stacks.items():
+            leaf_counts[stack.rsplit(";", 1)[-1]] += count
+        total = leaf_counts.total() or 1
+        return [(function, count / total) for function, count in leaf_counts.most_common(n)]
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None and (stack := collapse_stack(frame)):
+                self.stacks[stack] += 1
+
+
+def collapse_stack(frame: FrameType | None, /) -> str:
+    labels: list[str] = []
+    has_solution_frame = False
+    while frame is not None:
+        # NOTE: Everything above solution code belongs to santa itself.
+        if frame.f_code.co_filename.startswith(SANTA_PACKAGE_ROOT):
+            break
+        has_solution_frame |= frame.f_code.co_filename.startswith(SOLUTIONS_PREFIX)
+        labels.append(
+            format_function(
+                frame.f_code.co_filename, frame.f_code.co_firstlineno, frame.f_code.co_name
+            )
+        )
+        frame = frame.f_back
+    # NOTE: Stacks without solution code come from santa itself, e.g. from joining sampler.
+    return ";".join(reversed(labels)) if has_solution_frame else ""
+
+
+def format_function(filename: str, lineno: int, name: str, /) -> str:
+    # NOTE: Semicolon separates frames in collapsed stacks.
+    return f"{name} ({Path(filename).name}:{lineno})".replace(";", ":")
+
+
+def is_santa_function(function: Function, /) -> bool:
+    filename, _, name = function
+    # NOTE: Profiler is disabled from santa code, but the call is attributed to the solution.
+    return filename.startswith(SANTA_PACKAGE_ROOT) or name == PROFILER_DISABLE_NAME
+
+
+def collapse_profile(stats: pstats.Stats, /) -> Counter[str]:
+    """Collapsed stacks weighted by self time in microseconds, rebuilt from caller graph.
+
+    Profile keeps only caller and callee pairs, so time of a function is split between
+    its callers in proportion to the time each of them spent calling it. Recursive calls
+    are cut at the first repeated function.
+    """
+    # NOTE: Each caller of raw stats entry maps to the same tuple of primitive calls, calls,
+    # self time and cumulative time, but for calls from that caller only.
+    entries = {
+        function: entry
+        for function, entry in stats.stats.items()  # type: ignore[attr-defined]
+        if not is_santa_function(function)
+    }
+    caller_to_edges: dict[Function, list[tuple[Function, float]]] = {
+        function: [] for function in entries
+    }
+    roots: list[Function] = []
+    for function, (*_, callers) in entries.items():
+        solution_callers = {caller: edge for caller, edge in callers.items() if caller in entries}
+        if len(solution_callers) == 0:
+            roots.append(function)
+        for caller, edge in solution_callers.items():
+            caller_to_edges[caller].append((function, edge[3]))
+
+    stacks: Counter[str] = Counter()
+    # NOTE: Walked with explicit stack, since deep recursion of solution would exceed ours.
+    pending: list[tuple[tuple[Function, ...], float]] = [((root,), 1.0) for root in roots]
+    while pending:
+        path, share = pending.pop()
+        _, _, self_s, _, _ = entries[path[-1]]
+        if (self_us := round(self_s * share * 1e6)) > 0:
+            stacks[";".join(format_function(*function) for function in path)] += self_us
+        for callee, edge_cumulative_s in caller_to_edges[path[-1]]:
+            callee_cumulative_s = entries[callee][3]
+            if callee in path or callee_cumulative_s <= 0:
+                continue
+            callee_share = min(share * edge_cumulative_s / callee_cumulative_s, 1.0)
+            pending.append(((*path, callee), callee_share))
+    return stacks
+
+
+def write_collapsed_stacks(path: Path, stacks: Counter[str], /) -> Path:
+    path.write_text("".join(f"{stack} {count}\n" for stack, count in stacks.most_common()))
+    return path
+
+
+def get_hot_functions(stats: pstats.Stats, n: int, /) -> list[tuple[str, float]]:
+    # NOTE: Each entry of raw stats is (primitive calls, calls, self time, cumulative time, callers).
+    entries = {
+        function: entry
+        for function, entry in stats.stats.items()  # type: ignore[attr-defined]
+        if not is_santa_function(function)
+    }
+    total = sum(entry[2] for entry in entries.values()) or 1.0
+    ranked = sorted(entries.items(), key=lambda item: item[1][2], reverse=True)
+    return [
+        (format_function(filename, lineno, name), entry[2] / total)
+        for (filename, lineno, name), entry in ranked[:n]
+    ]
+
+
+def format_part_profiles(profiles: Sequence[PartProfile], /) -> str:
+    sections: list[str] = []
+    for profile in profiles:
+        sections.append(
+            "\n".join(
+                (
+                    f"Part {profile.part} {profile.mode.value} profile: {profile.path}",
+                    *(
+                        (f"Collapsed stacks: {profile.collapsed_path}",)
+                        if profile.collapsed_path != profile.path
+                        else ()
+                    ),
+                    format_table(
+                        ("SELF", "FUNCTION"),
+                        [(f"{share:.1%}", function) for function, share in profile.hot_functions],
+                    ),
+                )
+            )
+        )
+    return "\n\n".join(sections)
@@ -1,39 +1,202 @@
-import _thread
+import functools
+import json
 import re
-import selectors
+import shutil
 import subprocess
 import sys
-import threading
+import tempfile
+import time
+from collections.abc import Sequence
 from pathlib import Path
-from typing import Literal, TextIO, TypedDict, cast
+from typing import Annotated, Literal, NotRequired, TypedDict, cast
 
 import loguru
 import typer
 
-from ._langs import Lang
+from ._cache import AnswerCache
 from ._commands import LANG_TO_COMMAND
-from ._typer import CommonOpts, Part
-from ._utils import get_daily_present_root, resolve_parts
+from ._inprocess import PartHook, run_python_solution
+from ._langs import Lang
+from ._memory import MemoryTracer, PartMemory, format_part_memories
+from ._metrics import (
+    RunMetrics,
+    format_seconds,
+    format_table,
+    normalize_max_rss,
+)
+from ._profiler import ProfileMode, SolutionProfiler, format_part_profiles
+from ._typer import CommonOpts, InProcess, Part, UseCache
+from ._utils import get_daily_build_root, get_daily_present_root, resolve_parts
+from ._workers import WorkerPool
 
 
 class ParsedSolution(TypedDict):
     part: Literal["1", "2"]
     answer: str
+    metrics: NotRequired[RunMetrics]
 
 
 SOLUTION_RE = re.compile(r"Part (?P<part>1|2) solution: (?P<answer>\w+)")
 
+LAUNCHER_PATH = Path(__file__).absolute().parent / "_launcher.py"
 
-def solve_handler(*, ctx: typer.Context, part: Part = None) -> None:
+
+def solve_handler(
+    *,
+    ctx: typer.Context,
+    part: Part = None,
+    in_process: InProcess = True,
+    use_cache: UseCache = True,
+    metrics_json: Annotated[
+        Path | None,
+        typer.Option("--metrics-json", help="Export per part answers and metrics as JSON"),
+    ] = None,
+    profile: Annotated[
+        ProfileMode | None,
+        typer.Option(help="Profile in-process Python solution and report hot functions"),
+    ] = None,
+    memory: Annotated[
+        bool,
+        typer.Option(
+            "--memory",
+            help="Trace allocations of in-process Python solution and report peak memory",
+        ),
+    ] = False,
+) -> None:
     opts = getattr(ctx, CommonOpts.ATTRNAME, ...)
     assert isinstance(opts, CommonOpts), f"Typer context does not contain expected options: {opts}"
-    solve_puzzle(
-        lang=opts.lang,
-        year=opts.year,
-        day=opts.day,
-        part=part,
-        input_path=get_daily_present_root(year=opts.year, day=opts.day) / "input.txt",
+
+    if profile is not None and memory:
+        raise typer.BadParameter("Profiling and memory tracing cannot be combined")
+
+    part_hook: PartHook | None = None
+    profiler: SolutionProfiler | None = None
+    if profile is not None:
+        if opts.lang is not Lang.PYTHON or not in_process:
+            raise typer.BadParameter("Profiling is supported only for in-process Python solutions")
+        part_hook = profiler = SolutionProfiler(mode=profile, year=opts.year, day=opts.day)
+        # NOTE: Profiled solution must actually run, so cached answers are not used.
+        use_cache = False
+
+    tracer: MemoryTracer | None = None
+    if memory:
+        # NOTE: Other languages and Python subprocesses are reported by max RSS of the child.
+        if opts.lang is Lang.PYTHON and in_process:
+            part_hook = tracer = MemoryTracer()
+        use_cache = False
+
+    cache = AnswerCache() if use_cache else None
+    with WorkerPool() as pool:
+        # NOTE: Both parts are solved by a single run, metrics are still split between them.
+        parsed_solutions = solve_puzzle(
+            lang=opts.lang,
+            year=opts.year,
+            day=opts.day,
+            part=part,
+            input_path=get_daily_present_root(year=opts.year, day=opts.day) / "input.txt",
+            in_process=in_process,
+            pool=pool,
+            cache=cache,
+            part_hook=part_hook,
+        )
+
+    if any("metrics" in parsed_solution for parsed_solution in parsed_solutions):
+        typer.echo(format_metrics(parsed_solutions))
+
+    if profiler is not None:
+        typer.echo(format_part_profiles(profiler.profiles))
+
+    if memory:
+        memories = tracer.memories if tracer is not None else []
+        typer.echo(format_memory(parsed_solutions, memories))
+        if tracer is not None:
+            typer.echo(format_part_memories(memories))
+
+    if metrics_json is not None:
+        metrics_json.write_text(
+            json.dumps(
+                [
+                    {"year": opts.year, "day": opts.day, "lang": opts.lang.value, **parsed_solution}
+                    for parsed_solution in parsed_solutions
+                ],
+                indent=2,
+            )
+        )
+        loguru.logger.info(f"Metrics are exported to {metrics_json}")
+
+
+def format_metrics(parsed_solutions: Sequence[ParsedSolution], /) -> str:
+    header = ("PART", "ANSWER", "BUILD", "STARTUP", "PARSE", "WALL", "CPU", "MAX RSS")
+    rows: list[tuple[str, ...]] = []
+    for parsed_solution in parsed_solutions:
+        if (metrics := parsed_solution.get("metrics")) is None:
+            rows.append((parsed_solution["part"], parsed_solution["answer"], *("-",) * 6))
+            continue
+        rows.append(
+            (
+                parsed_solution["part"],
+                parsed_solution["answer"],
+                format_seconds(metrics["build_s"]),
+                format_seconds(metrics["startup_s"]),
+                format_seconds(metrics["parse_s"]),
+                format_seconds(metrics["wall_s"]),
+                format_seconds(metrics["cpu_s"]),
+                f"{metrics['max_rss_kb'] / 1024:.1f}MiB",
+            )
+        )
+    return format_table(header, rows)
+
+
+def format_memory(
+    parsed_solutions: Sequence[ParsedSolution], memories: Sequence[PartMemory], /
+) -> str:
+    part_to_memory = {memory.part: memory for memory in memories}
+    rows: list[tuple[str, ...]] = []
+    for parsed_solution in parsed_solutions:
+        metrics = parsed_solution.get("metrics")
+        memory = part_to_memory.get(int(parsed_solution["part"]))
+        rows.append(
+            (
+                parsed_solution["part"],
+                "-" if memory is None else f"{memory.peak_kb / 1024:.1f}MiB",
+                "-" if metrics is None else f"{metrics['max_rss_kb'] / 1024:.1f}MiB",
+            )
+        )
+    return format_table(("PART", "PEAK TRACED", "MAX RSS"), rows)
+
+
+def build_puzzle(*, lang: Lang, year: int, day: int) -> float:
+    """Build solution if language requires it and return seconds spent on building."""
+    command = LANG_TO_COMMAND[lang]
+    if command.build_popen_opts_ctor is None:
+        return 0.0
+
+    artifact = command.resolve_build_artifact(year=year, day=day)
+    if artifact is not None and artifact.exists():
+        loguru.logger.info(f"Build is up to date: {artifact}")
+        return 0.0
+
+    build_popen_opts = command.resolve_build_popen_opts(year=year, day=day)
+    loguru.logger.info("Building ...")
+    loguru.logger.info(build_popen_opts["cmd"])
+    start = time.perf_counter()
+    subprocess.check_call(
+        build_popen_opts["cmd"],
+        env=build_popen_opts["env"],
+        cwd=build_popen_opts["cwd"],
     )
+    build_s = time.perf_counter() - start
+    loguru.logger.info(f"Build OK in {build_s:.3f}s")
+
+    if artifact is not None:
+        # NOTE: Drop artifacts of previous source revisions of the same day.
+        daily_build_root = get_daily_build_root(lang=lang, year=year, day=day)
+        revision = artifact.relative_to(daily_build_root).parts[0]
+        for stale_root in daily_build_root.iterdir():
+            if stale_root.name != revision:
+                shutil.rmtree(stale_root, ignore_errors=True)
+
+    return build_s
 
 
 def solve_puzzle(
@@ -44,74 +207,144 @@ def solve_puzzle(
     part: int | None = None,
     input_path: Path,
     suppress_stdout: bool = False,
+    in_process: bool = False,
+    pool: WorkerPool | None = None,
+    build: bool = True,
+    cache: AnswerCache | None = None,
+    part_hook: PartHook | None = None,
+) -> list[ParsedSolution]:
+    solve = functools.partial(
+        _solve_puzzle,
+        lang=lang,
+        year=year,
+        day=day,
+        part=part,
+        input_path=input_path,
+        suppress_stdout=suppress_stdout,
+        in_process=in_process,
+        pool=pool,
+        build=build,
+        part_hook=part_hook,
+    )
+    if cache is None:
+        return solve()
+
+    part_to_key = {
+        part_: cache.make_key(lang=lang, year=year, day=day, part=part_, input_path=input_path)
+        for part_ in resolve_parts(part)
+    }
+    part_to_answer = {part_: cache.get(key) for part_, key in part_to_key.items()}
+    if all(answer is not None for answer in part_to_answer.values()):
+        loguru.logger.info("Using cached answers ...")
+        parsed_solutions: list[ParsedSolution] = []
+        for part_, answer in part_to_answer.items():
+            assert answer is not None
+            if not suppress_stdout:
+                sys.stdout.write(f"Part {part_} solution: {answer}\n")
+            parsed_solutions.append({"part": cast(Literal["1", "2"], str(part_)), "answer": answer})
+        return parsed_solutions
+
+    parsed_solutions = solve()
+    for parsed_solution in parsed_solutions:
+        cache.put(part_to_key[int(parsed_solution["part"])], parsed_solution["answer"])
+    return parsed_solutions
+
+
+def _solve_puzzle(
+    *,
+    lang: Lang,
+    year: int,
+    day: int,
+    part: int | None,
+    input_path: Path,
+    suppress_stdout: bool,
+    in_process: bool,
+    pool: WorkerPool | None,
+    build: bool,
+    part_hook: PartHook | None,
 ) -> list[ParsedSolution]:
     parsed_solutions: list[ParsedSolution] = []
 
-    # https://gist.github.com/nawatts/e2cdca610463200c12eac2a14efc0bfb
-    def stdout_handler(stream: TextIO) -> None:
-        line = stream.readline()
+    def line_handler(line: str) -> ParsedSolution | None:
         if not suppress_stdout:
             sys.stdout.write(line)
         if (match := SOLUTION_RE.match(line)) is None:
-            return
+            return None
         parsed_solution = cast(ParsedSolution, match.groupdict())
         parsed_solutions.append(parsed_solution)
+        return parsed_solution
 
-    command = LANG_TO_COMMAND[lang]
-    if command.build_popen_opts_ctor is not None:
-        build_popen_opts = command.resolve_build_popen_opts(year=year, day=day)
-        loguru.logger.info("Building ...")
-        loguru.logger.info(build_popen_opts["cmd"])
-        subprocess.check_call(
-            build_popen_opts["cmd"],
-            env=build_popen_opts["env"],
-            cwd=build_popen_opts["cwd"],
-        )
-        loguru.logger.info("Build OK")
+    if lang is Lang.PYTHON and in_process:
+        if pool is None or part_hook is not None:
+            loguru.logger.info("Running inference in-process ...")
+            run = run_python_solution(
+                year=year, day=day, part=part, input_path=input_path, part_hook=part_hook
+            )
+        else:
+            loguru.logger.info("Running inference in warm worker ...")
+            run = pool.solve(year=year, day=day, part=part, input_path=input_path)
+        for line in run["output"].splitlines(keepends=True):
+            if (parsed_solution := line_handler(line)) is not None and (
+                metrics := run["part_to_metrics"].get(int(parsed_solution["part"]))
+            ) is not None:
+                parsed_solution["metrics"] = metrics
+        return parsed_solutions
 
-    solve_popen_opts = command.resolve_solve_popen_opts(
-        year=year, day=day, part=part, input_path=input_path
-    )
-    loguru.logger.info("Running inference ...")
-    loguru.logger.info(solve_popen_opts["cmd"])
-    proc = subprocess.Popen(
-        solve_popen_opts["cmd"],
-        bufsize=1,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        universal_newlines=True,
-        env=solve_popen_opts["env"],
-        cwd=solve_popen_opts["cwd"],
-    )
+    build_s = build_puzzle(lang=lang, year=year, day=day) if build else 0.0
 
-    selector = selectors.DefaultSelector()
-    assert proc.stdout is not None
-    selector.register(proc.stdout, selectors.EVENT_READ, stdout_handler)
-
-    def handle(timeout: float | None = None) -> None:
-        for key, _ in selector.select(timeout):
-            key.data(key.fileobj)
-
-    while proc.poll() is None:
-        handle()
-
-    # NOTE(vshlenskii): This interval must be enough to read remaining lines.
-    timer = threading.Timer(2, _thread.interrupt_main)
-    timer.start()
-    try:
-        parts = resolve_parts(part)
-        while len(parsed_solutions) != len(parts):
-            handle()
-    finally:
-        timer.cancel()
-    selector.close()
-
-    if (return_code := proc.wait()) != 0:
-        selector.close()
-        raise subprocess.CalledProcessError(
-            return_code,
+    command = LANG_TO_COMMAND[lang]
+    with tempfile.TemporaryDirectory(prefix="santa-") as tmp_root:
+        report_path = Path(tmp_root) / "launch-report.txt"
+        solve_popen_opts = command.resolve_solve_popen_opts(
+            year=year,
+            day=day,
+            part=part,
+            input_path=input_path,
+            launcher=["python", "-I", "-S", str(LAUNCHER_PATH), str(report_path)],
+        )
+        loguru.logger.info("Running inference ...")
+        loguru.logger.info(solve_popen_opts["cmd"])
+        start = time.monotonic()
+        proc = subprocess.Popen(
             solve_popen_opts["cmd"],
-            stderr=str(proc.stderr),
+            bufsize=1,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+            env=solve_popen_opts["env"],
+            cwd=solve_popen_opts["cwd"],
         )
 
+        # NOTE: Solution output is drained line by line until EOF, which comes once the
+        # process and all of its children closed stdout. No polling, so this is safe to run
+        # concurrently.
+        solved_at: list[float] = []
+        assert proc.stdout is not None
+        with proc.stdout:
+            for line in proc.stdout:
+                if line_handler(line) is not None:
+                    solved_at.append(time.monotonic())
+
+        if proc.wait() != 0:
+            raise subprocess.CalledProcessError(proc.returncode, solve_popen_opts["cmd"])
+        # NOTE: Clock of the launcher is monotonic as well, so its moments are comparable.
+        launched_at, exited_at, cpu_s, ru_maxrss = report_path.read_text().split()
+
+    # NOTE: Startup is the time toolchain wrapper took to launch the solution, its own
+    # runtime startup is counted towards the first part. Part boundaries are taken from
+    # moments their answers were read, which may be slightly behind the solution exit.
+    # Runs without any parsed answer end at the solution exit and return no solutions.
+    boundaries = [float(launched_at), *solved_at[:-1], max([float(exited_at), *solved_at])]
+    for parsed_solution, part_start, part_end in zip(
+        parsed_solutions, boundaries, boundaries[1:], strict=False
+    ):
+        parsed_solution["metrics"] = {
+            "build_s": build_s,
+            "startup_s": float(launched_at) - start,
+            "parse_s": None,
+            "wall_s": part_end - part_start,
+            "cpu_s": float(cpu_s),
+            "max_rss_kb": normalize_max_rss(int(ru_maxrss)),
+        }
+
     return parsed_solutions
@@ -3,15 +3,18 @@ import re
 import sys
 import unittest
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Literal, NotRequired, TypedDict, assert_never, cast, override
+from typing import Literal, NamedTuple, NotRequired, TypedDict, assert_never, cast, override
 
 import typer
 
-from ._solver import solve_puzzle
-from ._typer import CommonOpts, Part
+from ._cache import AnswerCache
+from ._solver import build_puzzle, solve_puzzle
+from ._typer import CommonOpts, InProcess, Jobs, Part, UseCache
 from ._utils import get_daily_present_root, resolve_parts
+from ._workers import WorkerPool
 
 TEST_RE = re.compile(r"test_(?:p(?P<part>1|2)_)?n(?P<idx>\d+)_(?P<type>in|out)")
 
@@ -31,10 +34,20 @@ class TestCase:
         return self.puzzle is not None and self.answer is not None
 
 
+class Subcase(NamedTuple):
+    idx: int
+    part: Literal[1, 2]
+    puzzle: Path
+    answer: str
+
+
 def test_handler(
     *,
     ctx: typer.Context,
     part: Part = None,
+    in_process: InProcess = True,
+    jobs: Jobs = 1,
+    use_cache: UseCache = True,
 ) -> None:
     opts = getattr(ctx, CommonOpts.ATTRNAME, ...)
     assert isinstance(opts, CommonOpts), f"Typer context does not contain expected options: {opts}"
@@ -45,32 +58,29 @@ def test_handler(
 
         class TestCase(unittest.TestCase):
             def test(self) -> None:
-                for test_idx, test_part, test_case in tests:
-                    if test_part not in parts:
-                        continue
-
-                    for fpath_ in (test_case.puzzle, test_case.answer):
-                        if fpath_ is None or not fpath_.exists():
-                            raise FileExistsError(f"{fpath_} should exist")
-
-                    assert test_case.answer is not None
-                    assert test_case.puzzle is not None
-
-                    answer_lines = test_case.answer.read_text().splitlines()
-                    if len(answer_lines) == 0:
-                        raise FileExistsError(f"{test_case.answer} is empty")
-
-                    answer = answer_lines[0]
-
-                    with self.subTest(f"{test_idx = } {test_part = }"):
-                        solution = solve_puzzle(
+                subcases = resolve_subcases(tests, parts)
+                build_puzzle(lang=opts.lang, year=opts.year, day=opts.day)
+                with ThreadPoolExecutor(max_workers=jobs) as executor:
+                    futures = [
+                        executor.submit(
+                            solve_puzzle,
                             lang=opts.lang,
                             year=opts.year,
                             day=opts.day,
-                            part=test_part,
-                            input_path=test_case.puzzle,
-                        )[0]
-                        self.assertEqual(solution["answer"], answer)  # noqa: PT009
+                            part=subcase.part,
+                            input_path=subcase.puzzle,
+                            in_process=in_process,
+                            pool=pool,
+                            build=False,
+                            cache=cache,
+                        )
+                        for subcase in subcases
+                    ]
+                    # NOTE: Results are reported in collection order, not in completion order.
+                    for subcase, future in zip(subcases, futures, strict=True):
+                        with self.subTest(f"test_idx = {subcase.idx} test_part = {subcase.part}"):
+                            solution = future.result()[0]
+                            self.assertEqual(solution["answer"], subcase.answer)  # noqa: PT009
 
         return TestCase
 
@@ -89,7 +99,33 @@ def test_handler(
         stream=sys.stdout,
         resultclass=TextSubtestTestResult,
     )
-    test_runner.run(unittest.TestLoader().loadTestsFromTestCase(make_test_case()))
+    cache = AnswerCache() if use_cache else None
+    with WorkerPool(size=jobs) as pool:
+        test_runner.run(unittest.TestLoader().loadTestsFromTestCase(make_test_case()))
+
+
+def resolve_subcases(
+    tests: list[tuple[int, Literal[1, 2], TestCase]], parts: tuple[Literal[1, 2], ...]
+) -> list[Subcase]:
+    subcases: list[Subcase] = []
+    for test_idx, test_part, test_case in tests:
+        if test_part not in parts:
+            continue
+
+        for fpath_ in (test_case.puzzle, test_case.answer):
+            if fpath_ is None or not fpath_.exists():
+                raise FileExistsError(f"{fpath_} should exist")
+
+        assert test_case.answer is not None
+        assert test_case.puzzle is not None
+
+        answer_lines = test_case.answer.read_text().splitlines()
+        if len(answer_lines) == 0:
+            raise FileExistsError(f"{test_case.answer} is empty")
+
+        subcases.append(Subcase(test_idx, test_part, test_case.puzzle, answer_lines[0]))
+
+    return subcases
 
 
 def collect_tests(root: Path) -> list[tuple[int, Literal[1, 2], TestCase]]:
@@ -131,3 +131,21 @@ Part: TypeAlias = Annotated[
         max=2,
     ),
 ]
+
+InProcess: TypeAlias = Annotated[
+    bool,
+    typer.Option(
+        "--in-process/--subprocess",
+        help="Run Python solutions inside Santa process instead of spawning interpreter.",
+    ),
+]
+
+Jobs: TypeAlias = Annotated[
+    int,
+    typer.Option("-j", "--jobs", help="How many solutions to run concurrently.", min=1),
+]
+
+UseCache: TypeAlias = Annotated[
+    bool,
+    typer.Option("--cache/--no-cache", help="Reuse answers of unchanged solutions and inputs."),
+]
@@ -1,9 +1,18 @@
+import hashlib
+import os
+import subprocess
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Literal
 
-from ._defs import PRESENTS_ROOT, SOLUTIONS_ROOT
+from ._defs import BUILD_ROOT, DEFAULT_ENGINE, ENGINE_ENV, PRESENTS_ROOT, ROOT, SOLUTIONS_ROOT
 from ._langs import Lang
 
+# NOTE: Build outputs and caches that may live next to solution sources.
+IGNORED_SOURCE_NAMES = frozenset({"__pycache__", "target", ".git", "a.out"})
+
+HASH_CHUNK_SIZE = 1 << 20
+
 
 def get_daily_present_root(*, year: int, day: int) -> Path:
     return PRESENTS_ROOT.joinpath(f"y{year}", f"d{day:02d}")
@@ -13,6 +22,10 @@ def get_daily_solution_root(*, lang: Lang, year: int, day: int) -> Path:
     return get_lang_path(lang).joinpath("events", f"y{year}", f"d{day:02d}")
 
 
+def get_daily_build_root(*, lang: Lang, year: int, day: int) -> Path:
+    return BUILD_ROOT.joinpath(lang.value, f"y{year}", f"d{day:02d}")
+
+
 def get_elf_root(lang: Lang) -> Path:
     return get_lang_path(lang) / "elf"
 
@@ -25,6 +38,11 @@ def get_lang_path(lang: Lang) -> Path:
     return SOLUTIONS_ROOT.joinpath(lang.value.lower())
 
 
+def resolve_engine(lang: Lang, /) -> str:
+    """Engine solutions of `lang` run with. Only Python solutions provide alternative ones."""
+    return os.environ.get(ENGINE_ENV, DEFAULT_ENGINE) if lang is Lang.PYTHON else DEFAULT_ENGINE
+
+
 def resolve_parts(part: int | None | str, /) -> tuple[Literal[1, 2], ...]:
     match part:
         case None:
@@ -36,3 +54,41 @@ def resolve_parts(part: int | None | str, /) -> tuple[Literal[1, 2], ...]:
         case _:
             raise RuntimeError(f"Part {part} is not supported")
     return parts
+
+
+def get_git_revision() -> str:
+    """Current commit of the repository, suffixed with `-dirty` if there are local changes."""
+    revision = subprocess.check_output(["git", "rev-parse", "HEAD"], cwd=ROOT, text=True).strip()
+    status = subprocess.check_output(["git", "status", "--porcelain"], cwd=ROOT, text=True)
+    return f"{revision}-dirty" if status.strip() else revision
+
+
+def iter_source_files(root: Path, /, *, recursive: bool = True) -> Iterator[Path]:
+    """Yield files under `root` in stable order skipping build outputs and caches."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in IGNORED_SOURCE_NAMES)
+        for filename in sorted(filenames):
+            if filename not in IGNORED_SOURCE_NAMES:
+                yield Path(dirpath, filename)
+        if not recursive:
+            break
+
+
+def hash_files(paths: Iterable[Path], /, *, extra: Iterable[str] = (), names: bool = True) -> str:
+    """Hash contents of `paths` and `extra` strings. Paths relative to root are hashed too
+    unless `names` is disabled."""
+    hasher = hashlib.sha256()
+    for item in extra:
+        hasher.update(item.encode())
+        hasher.update(b"\0")
+    for path in paths:
+        if names:
+            hasher.update(
+                str(path.relative_to(ROOT) if path.is_relative_to(ROOT) else path).encode()
+            )
+            hasher.update(b"\0")
+        with path.open("rb") as f:
+            while chunk := f.read(HASH_CHUNK_SIZE):
+                hasher.update(chunk)
+        hasher.update(b"\0")
+    return hasher.hexdigest()
@@ -0,0 +1,141 @@
+import multiprocessing
+import queue
+import threading
+import traceback
+from multiprocessing.connection import Connection
+from multiprocessing.context import SpawnContext
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from types import TracebackType
+from typing import Literal, Self, TypedDict
+
+from loguru import logger
+
+from ._inprocess import InProcessRun, run_python_solution
+
+
+class Job(TypedDict):
+    year: int
+    day: int
+    part: int | None
+    input_path: Path
+
+
+class JobResult(TypedDict):
+    status: Literal["ok", "error"]
+    run: InProcessRun | None
+    traceback: str | None
+
+
+class WorkerError(RuntimeError):
+    pass
+
+
+class WorkerPool:
+    """Long-lived Python interpreters that solve puzzles in-process.
+
+    Workers are spawned lazily, up to `size` of them, and are reused across jobs, so
+    every job after the first one skips interpreter startup. The pool is thread-safe:
+    each job borrows an idle worker for its whole duration.
+    """
+
+    def __init__(self, *, size: int = 1) -> None:
+        assert size > 0, f"Pool size must be positive: {size}"
+        self._size = size
+        self._ctx = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._workers: list[_Worker] = []
+        self._idle: queue.SimpleQueue[_Worker] = queue.SimpleQueue()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def solve(self, *, year: int, day: int, part: int | None, input_path: Path) -> InProcessRun:
+        worker = self._acquire()
+        try:
+            result = worker.run({"year": year, "day": day, "part": part, "input_path": input_path})
+        except (EOFError, OSError) as e:
+            self._discard(worker)
+            raise WorkerError(f"Worker {worker.pid} died while solving {year}/{day:02d}") from e
+        self._idle.put(worker)
+
+        if result["run"] is None:
+            raise WorkerError(result["traceback"])
+        return result["run"]
+
+    def close(self) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.stop()
+
+    def _acquire(self) -> "_Worker":
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if len(self._workers) < self._size:
+                worker = _Worker.spawn(self._ctx)
+                self._workers.append(worker)
+                logger.debug(f"Spawned worker {worker.pid}")
+                return worker
+
+        return self._idle.get()
+
+    def _discard(self, worker: "_Worker", /) -> None:
+        with self._lock:
+            self._workers.remove(worker)
+        worker.stop()
+
+
+class _Worker:
+    def __init__(self, *, process: BaseProcess, conn: Connection) -> None:
+        self._process = process
+        self._conn = conn
+
+    @classmethod
+    def spawn(cls, ctx: SpawnContext, /) -> Self:
+        parent_conn, child_conn = ctx.Pipe()
+        process = ctx.Process(target=_serve, args=(child_conn,), daemon=True)
+        process.start()
+        child_conn.close()
+        return cls(process=process, conn=parent_conn)
+
+    @property
+    def pid(self) -> int | None:
+        return self._process.pid
+
+    def run(self, job: Job, /) -> JobResult:
+        self._conn.send(job)
+        return self._conn.recv()
+
+    def stop(self) -> None:
+        try:
+            self._conn.send(None)
+        except OSError:
+            pass
+        self._conn.close()
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.kill()
+
+
+def _serve(conn: Connection, /) -> None:
+    while (job := conn.recv()) is not None:
+        try:
+            run = run_python_solution(**job)
+            result: JobResult = {"status": "ok", "run": run, "traceback": None}
+        except Exception:  # noqa: BLE001
+            result = {"status": "error", "run": None, "traceback": traceback.format_exc()}
+        conn.send(result)
+    conn.close()
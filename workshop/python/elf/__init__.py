@@ -1,13 +1,30 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import importlib.util
+import mmap
+import os
 from pathlib import Path
 
 TYPE_CHECKING = False
 if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator, Sequence
     from typing import Any, Literal
     from _typeshed import SupportsDunderLT
 
+CHUNK_SIZE = 1 << 20
+
+ENGINE_ENV = "ELF_ENGINE"
+ENGINES = ("python", "numpy")
+
+# NOTE: Directions are (dx, dy) pairs, y grows downwards like row numbers do.
+UP, DOWN, LEFT, RIGHT = (0, -1), (0, 1), (-1, 0), (1, 0)
+UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT = (-1, -1), (1, -1), (-1, 1), (1, 1)
+ORTHOGONAL = (UP, RIGHT, DOWN, LEFT)
+DIAGONAL = (UP_RIGHT, DOWN_RIGHT, DOWN_LEFT, UP_LEFT)
+ALL_DIRECTIONS = ORTHOGONAL + DIAGONAL
+
 
 def cmp(lhs: SupportsDunderLT, rhs: SupportsDunderLT, /) -> Literal[-1, 0, 1]:
     if lhs < rhs:
@@ -28,13 +45,180 @@ def read_file_rows(path: Path, /) -> list[str]:
     return out
 
 
+def iter_rows(path: Path, /) -> Iterator[str]:
+    """Lazily yield rows of file without line endings, keeping only one row in memory."""
+    if not path.exists():
+        raise FileNotFoundError(path)
+    if path.stat().st_size == 0:
+        raise RuntimeError(f"File {path} is empty")
+
+    with path.open() as f:
+        for line in f:
+            yield line.rstrip("\r\n")
+
+
+def iter_chunks(path: Path, /, *, size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    """Lazily yield blocks of roughly `size` bytes, each of them ending at row boundary.
+
+    Blocks hold whole rows, so they can be split with `bytes.splitlines` and processed
+    in batches, while memory stays bounded by block size.
+    """
+    if not path.exists():
+        raise FileNotFoundError(path)
+
+    with path.open("rb") as f:
+        tail = b""
+        while block := f.read(size):
+            block = tail + block
+            cut = block.rfind(b"\n") + 1
+            tail = block[cut:]
+            if cut > 0:
+                yield block[:cut]
+        if tail:
+            yield tail
+
+
+@contextlib.contextmanager
+def map_input(path: Path, /) -> Iterator[mmap.mmap]:
+    """Map file into memory read-only.
+
+    Mapped file supports buffer protocol, so bytes patterns of `re` scan it directly,
+    without decoding it to `str` and without reading it into memory upfront.
+    """
+    if not path.exists():
+        raise FileNotFoundError(path)
+    if path.stat().st_size == 0:
+        raise RuntimeError(f"File {path} is empty")
+
+    with (
+        path.open("rb") as f,
+        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        yield data
+
+
+class Grid:
+    """Rectangular grid of single byte cells stored row by row in one flat `bytearray`.
+
+    Cells are addressed by flat index `y * width + x`. Lookups need no hashing, each
+    cell takes a single byte and rays are plain `range` objects of flat indices, so
+    walking along them needs no bounds checks.
+    """
+
+    __slots__ = ("cells", "height", "width")
+
+    def __init__(self, cells: bytearray, /, *, width: int) -> None:
+        if width <= 0 or len(cells) % width != 0:
+            raise ValueError(f"Grid of {len(cells)} cells cannot have width {width}")
+        self.cells = cells
+        self.width = width
+        self.height = len(cells) // width
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[str | bytes], /) -> Grid:
+        encoded = [row.encode() if isinstance(row, str) else row for row in rows]
+        if len(encoded) == 0:
+            raise ValueError("Grid must have at least one row")
+        if any(len(row) != len(encoded[0]) for row in encoded):
+            raise ValueError("Grid rows must have the same width")
+        return cls(bytearray().join(encoded), width=len(encoded[0]))
+
+    @classmethod
+    def read(cls, path: Path, /) -> Grid:
+        if not path.exists():
+            raise FileNotFoundError(path)
+        return cls.from_rows(path.read_bytes().splitlines())
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __getitem__(self, idx: int, /) -> int:
+        return self.cells[idx]
+
+    def __setitem__(self, idx: int, value: int, /) -> None:
+        self.cells[idx] = value
+
+    def index(self, x: int, y: int, /) -> int:
+        return y * self.width + x
+
+    def position(self, idx: int, /) -> tuple[int, int]:
+        y, x = divmod(idx, self.width)
+        return x, y
+
+    def contains(self, x: int, y: int, /) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get(self, x: int, y: int, /, default: int | None = None) -> int | None:
+        return self.cells[y * self.width + x] if self.contains(x, y) else default
+
+    def row(self, y: int, /) -> bytearray:
+        return self.cells[y * self.width : (y + 1) * self.width]
+
+    def column(self, x: int, /) -> bytearray:
+        return self.cells[x :: self.width]
+
+    def find(self, value: bytes, /, start: int = 0) -> int:
+        """Flat index of the first cell equal to `value` or -1."""
+        return self.cells.find(value, start)
+
+    def find_all(self, value: bytes, /) -> Iterator[int]:
+        idx = self.cells.find(value)
+        while idx != -1:
+            yield idx
+            idx = self.cells.find(value, idx + 1)
+
+    def ray(self, idx: int, direction: tuple[int, int], /) -> range:
+        """Flat indices of cells from `idx` towards `direction` up to the edge, `idx` excluded."""
+        dx, dy = direction
+        y, x = divmod(idx, self.width)
+        n_steps = min(
+            _count_steps(x, dx, self.width),
+            _count_steps(y, dy, self.height),
+        )
+        step = dy * self.width + dx
+        return range(idx + step, idx + step * (n_steps + 1), step)
+
+    def neighbors(
+        self, idx: int, /, directions: Sequence[tuple[int, int]] = ORTHOGONAL
+    ) -> Iterator[int]:
+        y, x = divmod(idx, self.width)
+        for dx, dy in directions:
+            if 0 <= x + dx < self.width and 0 <= y + dy < self.height:
+                yield idx + dy * self.width + dx
+
+
+def _count_steps(pos: int, delta: int, size: int, /) -> int:
+    if delta > 0:
+        return (size - 1 - pos) // delta
+    if delta < 0:
+        return pos // -delta
+    return size
+
+
+def get_engine() -> Literal["python", "numpy"]:
+    """Engine selected for current run with `ELF_ENGINE` environment variable.
+
+    Solutions may provide alternative implementations, e.g. vectorized with NumPy, so
+    that they can be benchmarked against each other on the same inputs.
+    """
+    engine = os.environ.get(ENGINE_ENV, "python")
+    if engine not in ENGINES:
+        raise RuntimeError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+    if engine == "numpy" and importlib.util.find_spec("numpy") is None:
+        raise RuntimeError(
+            f"Engine {engine!r} requires NumPy, which is optional and not installed. "
+            "Add it to the environment, e.g. with `pixi add numpy`"
+        )
+    return engine  # type: ignore[return-value]
+
+
 def print_solution(part: Literal[1, 2], solution: Any) -> None:
     print(f"Part {part} solution: {solution}")
 
 
 def parse_command_line() -> tuple[list[Literal[1, 2]], Path]:
     parser = argparse.ArgumentParser()
-    parser.add_argument("-p", help="Puzzle part to solve", required=True)
+    parser.add_argument("-p", help="Puzzle part to solve. Leave blank for both parts")
     parser.add_argument("-i", help="File with puzzle input", required=True)
 
     args = parser.parse_args()
@@ -48,3 +232,25 @@ def parse_command_line() -> tuple[list[Literal[1, 2]], Path]:
             parts = [1, 2]
 
     return parts, Path(args.i)
+
+
+def run[T](
+    solve_first_part: Callable[[T], None],
+    solve_second_part: Callable[[T], None],
+    /,
+    *,
+    parse: Callable[[Path], T] | None = None,
+) -> None:
+    """Solve parts requested in command line.
+
+    If `parse` is passed, input is parsed once and its result is handed to both parts,
+    otherwise parts get path to input.
+    """
+    parts, path = parse_command_line()
+    data: Any = path if parse is None else parse(path)
+    for part in parts:
+        match part:
+            case 1:
+                solve_first_part(data)
+            case 2:
+                solve_second_part(data)
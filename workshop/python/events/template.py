@@ -1,29 +1,26 @@
 from pathlib import Path
-from typing import assert_never
 
 import elf
 
+type Data = list[str]
 
-def solve_first_part(__p: Path, /) -> None:
-    solution = f"Unimplemented. No solution for {__p!s}"
+
+def parse(__p: Path, /) -> Data:
+    return __p.read_text().splitlines()
+
+
+def solve_first_part(data: Data, /) -> None:
+    solution = f"Unimplemented. No solution for {len(data)} rows"
     elf.print_solution(1, solution)
 
 
-def solve_second_part(__p: Path, /) -> None:
-    solution = f"Unimplemented. No solution for {__p!s}"
+def solve_second_part(data: Data, /) -> None:
+    solution = f"Unimplemented. No solution for {len(data)} rows"
     elf.print_solution(2, solution)
 
 
 def main() -> None:
-    parts, input = elf.parse_command_line()
-    for part in parts:
-        match part:
-            case 1:
-                solve_first_part(input)
-            case 2:
-                solve_second_part(input)
-            case _:
-                assert_never(part)
+    elf.run(solve_first_part, solve_second_part, parse=parse)
 
 
 if __name__ == "__main__":
@@ -1,57 +1,49 @@
 import heapq
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
 import elf
 
+FIRST_PART_TOP_K = 1
+SECOND_PART_TOP_K = 3
+# NOTE: Parse stage keeps just enough largest groups for every part to pick its own.
+TOP_K = max(FIRST_PART_TOP_K, SECOND_PART_TOP_K)
 
-def solve_first_part(filepath: str) -> None:
-    lines = elf.read_file_rows(filepath)
-    max_calories = 0
-    current_calories = 0
 
+def iter_group_sums(lines: Iterable[str]) -> Iterator[int]:
+    """Yields sums of groups of numbers separated by blank lines"""
+    current_calories = 0
     for line in lines:
-        if line.strip() == "":
-            max_calories = max(current_calories, max_calories)
-            current_calories = 0
+        line = line.strip()
+        if line:
+            current_calories += int(line)
         else:
-            current_calories += int(line.strip())
+            yield current_calories
+            current_calories = 0
 
     # Don't forget the last elf
-    max_calories = max(current_calories, max_calories)
-    elf.print_solution(1, max_calories)
+    yield current_calories
 
 
-def solve_second_part(filepath: str) -> None:
-    lines = elf.read_file_rows(filepath)
-    # Keep track of top 3 calorie counts using a min heap
-    heap = []
-    current_calories = 0
+def find_top_sums(lines: Iterable[str], k: int) -> list[int]:
+    """Returns `k` largest group sums in descending order, keeping only them in memory"""
+    return heapq.nlargest(k, iter_group_sums(lines))
 
-    for line in lines:
-        if line.strip() == "":
-            if len(heap) >= 3:
-                heapq.heappushpop(heap, current_calories)
-            else:
-                heapq.heappush(heap, current_calories)
-            current_calories = 0
-        else:
-            current_calories += int(line.strip())
 
-    # Don't forget the last elf
-    if len(heap) >= 3:
-        heapq.heappushpop(heap, current_calories)
-    else:
-        heapq.heappush(heap, current_calories)
+def parse(filepath: Path) -> list[int]:
+    return find_top_sums(elf.iter_rows(filepath), TOP_K)
 
-    elf.print_solution(2, sum(heap))
 
+def solve_first_part(top_calories: list[int]) -> None:
+    elf.print_solution(1, sum(top_calories[:FIRST_PART_TOP_K]))
 
-def main():
-    parts, input_path = elf.parse_command_line()
 
-    for part in parts:
-        if part == 1:
-            solve_first_part(input_path)
-        elif part == 2:
-            solve_second_part(input_path)
+def solve_second_part(top_calories: list[int]) -> None:
+    elf.print_solution(2, sum(top_calories[:SECOND_PART_TOP_K]))
+
+
+def main():
+    elf.run(solve_first_part, solve_second_part, parse=parse)
 
 
 if __name__ == "__main__":
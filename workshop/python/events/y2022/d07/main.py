@@ -1,39 +1,34 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Dict, Optional
+from pathlib import Path
 import elf
 
+ROOT_IDX = 0
 
-@dataclass
-class File:
-    name: str
-    size: int
+type Sizes = list[int]
 
 
-@dataclass
-class Directory:
-    name: str
-    parent: Optional[Directory] = None
-    subdirs: Dict[str, Directory] = field(default_factory=dict)
-    files: Dict[str, File] = field(default_factory=dict)
+def parse(filepath: Path) -> Sizes:
+    """Total sizes of all directories, indexed by order of discovery, root first.
 
-    @property
-    def size(self) -> int:
-        total = sum(f.size for f in self.files.values())
-        total += sum(d.size for d in self.subdirs.values())
-        return total
+    Directories are kept in flat arrays instead of a tree. A directory is always discovered
+    after its parent, so a single reverse pass adds every directory to its parent after all
+    of its own subdirectories were added to it.
+    """
+    parents = [ROOT_IDX]
+    sizes = [0]
+    subdirs: dict[tuple[int, str], int] = {}
+    files: set[tuple[int, str]] = set()
+    current = ROOT_IDX
 
-    def all_dirs(self):
-        yield self
-        for subdir in self.subdirs.values():
-            yield from subdir.all_dirs()
+    def get_subdir(name: str) -> int:
+        key = (current, name)
+        if key not in subdirs:
+            subdirs[key] = len(parents)
+            parents.append(current)
+            sizes.append(0)
+        return subdirs[key]
 
-
-def parse_filesystem(lines: list[str]) -> Directory:
-    root = Directory("/")
-    current = root
-
-    for line in lines:
+    for line in elf.iter_rows(filepath):
         line = line.strip()
         if not line:
             continue
@@ -41,53 +36,38 @@ def parse_filesystem(lines: list[str]) -> Directory:
         if line.startswith("$ cd"):
             path = line[5:]
             if path == "/":
-                current = root
+                current = ROOT_IDX
             elif path == "..":
-                if current.parent:
-                    current = current.parent
+                current = parents[current]
             else:
-                if path not in current.subdirs:
-                    current.subdirs[path] = Directory(path, current)
-                current = current.subdirs[path]
+                current = get_subdir(path)
         elif line.startswith("$ ls"):
             continue
         else:
-            parts = line.split()
-            if parts[0] == "dir":
-                name = parts[1]
-                if name not in current.subdirs:
-                    current.subdirs[name] = Directory(name, current)
-            else:
-                size = int(parts[0])
-                name = parts[1]
-                current.files[name] = File(name, size)
+            size, name = line.split(maxsplit=1)
+            if size == "dir":
+                get_subdir(name)
+            elif (current, name) not in files:
+                files.add((current, name))
+                sizes[current] += int(size)
 
-    return root
+    for idx in range(len(sizes) - 1, ROOT_IDX, -1):
+        sizes[parents[idx]] += sizes[idx]
 
+    return sizes
 
-def solve_first_part(filepath: str) -> None:
-    lines = elf.read_file_rows(filepath)
-    root = parse_filesystem(lines)
 
+def solve_first_part(sizes: Sizes) -> None:
     MAX_DIR_SIZE = 100_000
-    total = 0
-
-    for dir_ in root.all_dirs():
-        dir_size = dir_.size
-        if dir_size <= MAX_DIR_SIZE:
-            total += dir_size
 
-    elf.print_solution(1, total)
+    elf.print_solution(1, sum(size for size in sizes if size <= MAX_DIR_SIZE))
 
 
-def solve_second_part(filepath: str) -> None:
-    lines = elf.read_file_rows(filepath)
-    root = parse_filesystem(lines)
-
+def solve_second_part(sizes: Sizes) -> None:
     TOTAL_DISK_SPACE = 70_000_000
     REQUIRED_SPACE = 30_000_000
 
-    used_space = root.size
+    used_space = sizes[ROOT_IDX]
     free_space = TOTAL_DISK_SPACE - used_space
     need_to_free = REQUIRED_SPACE - free_space
 
@@ -95,22 +75,12 @@ def solve_second_part(filepath: str) -> None:
         elf.print_solution(2, 0)
         return
 
-    candidates = []
-    for dir_ in root.all_dirs():
-        if dir_.size >= need_to_free:
-            candidates.append(dir_.size)
-
-    elf.print_solution(2, min(candidates) if candidates else 0)
+    smallest_size = min((size for size in sizes if size >= need_to_free), default=0)
+    elf.print_solution(2, smallest_size)
 
 
 def main():
-    parts, input_path = elf.parse_command_line()
-
-    for part in parts:
-        if part == 1:
-            solve_first_part(input_path)
-        elif part == 2:
-            solve_second_part(input_path)
+    elf.run(solve_first_part, solve_second_part, parse=parse)
 
 
 if __name__ == "__main__":
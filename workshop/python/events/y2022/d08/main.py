@@ -1,108 +1,151 @@
 #!/usr/bin/env python3
 
-import elf
-from typing import List, Tuple
+from __future__ import annotations
 
+from pathlib import Path
 
-def parse_forest(lines: List[str]) -> List[List[int]]:
-    grid = []
-    for line in lines:
-        line = line.strip()
-        if line:
-            grid.append([int(c) for c in line])
-    return grid
+import elf
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
 
-def is_visible(grid: List[List[int]], row: int, col: int) -> bool:
-    height = grid[row][col]
-    rows = len(grid)
-    cols = len(grid[0])
 
-    if row == 0 or row == rows - 1 or col == 0 or col == cols - 1:
-        return True
+def parse(filepath: Path) -> elf.Grid:
+    return elf.Grid.read(filepath)
 
-    visible_from_left = all(grid[row][c] < height for c in range(col))
-    visible_from_right = all(grid[row][c] < height for c in range(col + 1, cols))
-    visible_from_top = all(grid[r][col] < height for r in range(row))
-    visible_from_bottom = all(grid[r][col] < height for r in range(row + 1, rows))
 
+def is_visible(row: bytearray, column: bytearray, x: int, y: int) -> bool:
+    height = row[x]
+    # NOTE: Edge trees have an empty line of sight, so they are visible.
     return (
-        visible_from_left
-        or visible_from_right
-        or visible_from_top
-        or visible_from_bottom
+        all(tree < height for tree in row[:x])
+        or all(tree < height for tree in row[x + 1 :])
+        or all(tree < height for tree in column[:y])
+        or all(tree < height for tree in column[y + 1 :])
     )
 
 
-def calculate_scenic_score(grid: List[List[int]], row: int, col: int) -> int:
-    height = grid[row][col]
-    rows = len(grid)
-    cols = len(grid[0])
-
-    if row == 0 or row == rows - 1 or col == 0 or col == cols - 1:
-        return 0
+def calculate_scenic_score(row: bytearray, column: bytearray, x: int, y: int) -> int:
+    height = row[x]
 
     left_count = 0
-    for c in range(col - 1, -1, -1):
+    for c in range(x - 1, -1, -1):
         left_count += 1
-        if grid[row][c] >= height:
+        if row[c] >= height:
             break
 
     right_count = 0
-    for c in range(col + 1, cols):
+    for c in range(x + 1, len(row)):
         right_count += 1
-        if grid[row][c] >= height:
+        if row[c] >= height:
             break
 
     up_count = 0
-    for r in range(row - 1, -1, -1):
+    for r in range(y - 1, -1, -1):
         up_count += 1
-        if grid[r][col] >= height:
+        if column[r] >= height:
             break
 
     down_count = 0
-    for r in range(row + 1, rows):
+    for r in range(y + 1, len(column)):
         down_count += 1
-        if grid[r][col] >= height:
+        if column[r] >= height:
             break
 
     return left_count * right_count * up_count * down_count
 
 
-def solve_first_part(filepath: str) -> None:
-    lines = elf.read_file_rows(filepath)
-    grid = parse_forest(lines)
-
+def load_heights(grid: elf.Grid) -> npt.NDArray[np.int8]:
+    # NOTE: NumPy is optional, so it is imported only when its engine is selected.
+    import numpy as np
+
+    heights = np.frombuffer(grid.cells, dtype=np.uint8).reshape(grid.height, grid.width)
+    return (heights - ord("0")).astype(np.int8)
+
+
+def count_visible_trees_numpy(heights: npt.NDArray[np.int8]) -> int:
+    import numpy as np
+
+    visible = np.zeros(heights.shape, dtype=bool)
+    # NOTE: Each view is a flip or a transpose, so a single pass towards lower column
+    # indices covers every direction. A tree is visible if it is taller than cumulative
+    # maximum of trees before it.
+    for view, visible_view in (
+        (heights, visible),
+        (heights[:, ::-1], visible[:, ::-1]),
+        (heights.T, visible.T),
+        (heights.T[:, ::-1], visible.T[:, ::-1]),
+    ):
+        tallest_before = np.full(view.shape, -1, dtype=np.int8)
+        np.maximum.accumulate(view[:, :-1], axis=1, out=tallest_before[:, 1:])
+        visible_view |= view > tallest_before
+    return int(visible.sum())
+
+
+def calculate_max_scenic_score_numpy(heights: npt.NDArray[np.int8]) -> int:
+    import numpy as np
+
+    def calculate_viewing_distances(
+        view: npt.NDArray[np.int8],
+    ) -> npt.NDArray[np.int32]:
+        """Viewing distances towards lower row indices, rows are processed all at once."""
+        n_rows, n_cols = view.shape
+        columns = np.arange(n_cols)
+        levels = np.arange(10, dtype=np.int8)[:, None]
+        # NOTE: Row of the nearest tree at least as tall as every height, for every column.
+        # Row 0 stands for both a tree at the edge and no tree at all.
+        nearest = np.zeros((10, n_cols), dtype=np.int32)
+        distances = np.empty(view.shape, dtype=np.int32)
+        for y in range(n_rows):
+            row = view[y]
+            distances[y] = y - nearest[row, columns]
+            nearest[levels <= row] = y
+        return distances
+
+    # NOTE: Every direction is turned into looking up, so that rows stay contiguous.
+    transposed = np.ascontiguousarray(heights.T)
+    scores = np.ones(heights.shape, dtype=np.int64)
+    scores *= calculate_viewing_distances(heights)
+    scores *= calculate_viewing_distances(heights[::-1])[::-1]
+    scores *= calculate_viewing_distances(transposed).T
+    scores *= calculate_viewing_distances(transposed[::-1])[::-1].T
+    return int(scores.max())
+
+
+def solve_first_part(grid: elf.Grid) -> None:
+    if elf.get_engine() == "numpy":
+        elf.print_solution(1, count_visible_trees_numpy(load_heights(grid)))
+        return
+
+    columns = [grid.column(x) for x in range(grid.width)]
     visible_count = 0
-    for row in range(len(grid)):
-        for col in range(len(grid[0])):
-            if is_visible(grid, row, col):
-                visible_count += 1
+    for y in range(grid.height):
+        row = grid.row(y)
+        for x in range(grid.width):
+            visible_count += is_visible(row, columns[x], x, y)
 
     elf.print_solution(1, visible_count)
 
 
-def solve_second_part(filepath: str) -> None:
-    lines = elf.read_file_rows(filepath)
-    grid = parse_forest(lines)
+def solve_second_part(grid: elf.Grid) -> None:
+    if elf.get_engine() == "numpy":
+        elf.print_solution(2, calculate_max_scenic_score_numpy(load_heights(grid)))
+        return
 
+    columns = [grid.column(x) for x in range(grid.width)]
     max_score = 0
-    for row in range(len(grid)):
-        for col in range(len(grid[0])):
-            score = calculate_scenic_score(grid, row, col)
-            max_score = max(max_score, score)
+    for y in range(grid.height):
+        row = grid.row(y)
+        for x in range(grid.width):
+            max_score = max(max_score, calculate_scenic_score(row, columns[x], x, y))
 
     elf.print_solution(2, max_score)
 
 
 def main():
-    parts, input_path = elf.parse_command_line()
-
-    for part in parts:
-        if part == 1:
-            solve_first_part(input_path)
-        elif part == 2:
-            solve_second_part(input_path)
+    elf.run(solve_first_part, solve_second_part, parse=parse)
 
 
 if __name__ == "__main__":
@@ -1,80 +1,66 @@
 #!/usr/bin/env python3
 
+from collections.abc import Iterable, Iterator
+
 import elf
-from typing import List, Tuple, Set
+
+# NOTE: Positions are packed into a single int as `x + y * ROW_STRIDE`, which is exact
+# while coordinates stay within 2**31 of the origin. Unit moves become additions, and
+# every gap between adjacent knots maps to a single packed int.
+ROW_STRIDE = 1 << 32
+
+DIRECTION_TO_DELTA = {"R": 1, "L": -1, "U": ROW_STRIDE, "D": -ROW_STRIDE}
+
+# NOTE: Knot moves one step towards the previous knot unless they touch. Gaps never exceed
+# two steps per axis, since every knot moves at most one step diagonally at a time.
+GAP_TO_FOLLOW_DELTA = {
+    gap_x + gap_y * ROW_STRIDE: (
+        0
+        if abs(gap_x) <= 1 and abs(gap_y) <= 1
+        else (gap_x > 0) - (gap_x < 0) + ((gap_y > 0) - (gap_y < 0)) * ROW_STRIDE
+    )
+    for gap_x in range(-2, 3)
+    for gap_y in range(-2, 3)
+}
 
 
-def parse_moves(lines: List[str]) -> List[Tuple[str, int]]:
-    moves = []
+def parse_moves(lines: Iterable[str]) -> Iterator[tuple[int, int]]:
     for line in lines:
         line = line.strip()
         if line:
             direction, steps = line.split()
-            moves.append((direction, int(steps)))
-    return moves
-
-
-def sign(n: int) -> int:
-    if n > 0:
-        return 1
-    elif n < 0:
-        return -1
-    return 0
-
+            yield DIRECTION_TO_DELTA[direction], int(steps)
 
-def move_head(head: Tuple[int, int], direction: str) -> Tuple[int, int]:
-    x, y = head
-    if direction == "R":
-        return (x + 1, y)
-    elif direction == "L":
-        return (x - 1, y)
-    elif direction == "U":
-        return (x, y + 1)
-    elif direction == "D":
-        return (x, y - 1)
-    return head
 
+def simulate_rope(moves: Iterable[tuple[int, int]], rope_length: int) -> int:
+    # NOTE: Knots are updated in place, and a knot that stays still leaves the rest of
+    # the rope still as well, so propagation stops there.
+    knots = [0] * rope_length
+    visited = {0}
 
-def follow(head: Tuple[int, int], tail: Tuple[int, int]) -> Tuple[int, int]:
-    hx, hy = head
-    tx, ty = tail
-
-    dx = hx - tx
-    dy = hy - ty
-
-    if abs(dx) <= 1 and abs(dy) <= 1:
-        return tail
-
-    return (tx + sign(dx), ty + sign(dy))
-
-
-def simulate_rope(moves: List[Tuple[str, int]], rope_length: int) -> int:
-    rope = [(0, 0)] * rope_length
-    visited = set()
-    visited.add(rope[-1])
-
-    for direction, steps in moves:
+    for delta, steps in moves:
         for _ in range(steps):
-            rope[0] = move_head(rope[0], direction)
+            knots[0] += delta
 
             for i in range(1, rope_length):
-                rope[i] = follow(rope[i - 1], rope[i])
-
-            visited.add(rope[-1])
+                follow_delta = GAP_TO_FOLLOW_DELTA[knots[i - 1] - knots[i]]
+                if not follow_delta:
+                    break
+                knots[i] += follow_delta
+            else:
+                visited.add(knots[-1])
 
     return len(visited)
 
 
 def solve_first_part(filepath: str) -> None:
-    lines = elf.read_file_rows(filepath)
-    moves = parse_moves(lines)
+    moves = parse_moves(elf.iter_rows(filepath))
     result = simulate_rope(moves, 2)
     elf.print_solution(1, result)
 
 
 def solve_second_part(filepath: str) -> None:
-    lines = elf.read_file_rows(filepath)
-    moves = parse_moves(lines)
+    moves = parse_moves(elf.iter_rows(filepath))
     result = simulate_rope(moves, 10)
     elf.print_solution(2, result)
 
@@ -1,75 +1,101 @@
 #!/usr/bin/env python3
 
+import bisect
+from collections.abc import Iterable, Iterator
+
 import elf
-from typing import List, Tuple
+
+type Span = tuple[range, int]
 
 
-def parse_instructions(lines: List[str]) -> List[Tuple[str, int]]:
-    instructions = []
+def parse_instructions(lines: Iterable[str]) -> Iterator[tuple[str, int]]:
     for line in lines:
         line = line.strip()
         if not line:
             continue
         parts = line.split()
         if parts[0] == "noop":
-            instructions.append(("noop", 0))
+            yield "noop", 0
         elif parts[0] == "addx":
-            instructions.append(("addx", int(parts[1])))
-    return instructions
+            yield "addx", int(parts[1])
 
 
-def execute_program(instructions: List[Tuple[str, int]]) -> List[int]:
-    """Returns the value of X register at each cycle"""
+def execute_program(instructions: Iterable[tuple[str, int]]) -> Iterator[Span]:
+    """Yields runs of consecutive cycles, during which X register keeps its value"""
     x = 1
-    cycle_values = [x]
+    start = cycle = 1
 
     for instruction, value in instructions:
         if instruction == "noop":
-            cycle_values.append(x)
+            cycle += 1
         elif instruction == "addx":
-            cycle_values.append(x)
-            cycle_values.append(x)
-            x += value
+            cycle += 2
+            if value:
+                yield range(start, cycle), x
+                start = cycle
+                x += value
+
+    # NOTE: Value set by the last instruction is never seen by any cycle.
+    if start < cycle:
+        yield range(start, cycle), x
+
 
-    return cycle_values
+def index_spans(spans: Iterable[Span]) -> tuple[list[int], list[int], int]:
+    """Returns first cycles of spans, their X values and the cycle after the last one"""
+    starts = []
+    values = []
+    end = 1
+    for cycles, x in spans:
+        starts.append(cycles.start)
+        values.append(x)
+        end = cycles.stop
+    return starts, values, end
+
+
+def find_register_value(
+    starts: list[int], values: list[int], end: int, cycle: int
+) -> int | None:
+    if not 1 <= cycle < end:
+        return None
+    return values[bisect.bisect_right(starts, cycle) - 1]
 
 
 def solve_first_part(filepath: str) -> None:
-    lines = elf.read_file_rows(filepath)
-    instructions = parse_instructions(lines)
-    cycle_values = execute_program(instructions)
+    instructions = parse_instructions(elf.iter_rows(filepath))
+    starts, values, end = index_spans(execute_program(instructions))
 
     signal_sum = 0
     check_cycles = [20, 60, 100, 140, 180, 220]
 
     for cycle in check_cycles:
-        if cycle < len(cycle_values):
-            signal_strength = cycle * cycle_values[cycle]
-            signal_sum += signal_strength
+        x = find_register_value(starts, values, end, cycle)
+        if x is not None:
+            signal_sum += cycle * x
 
     elf.print_solution(1, signal_sum)
 
 
 def solve_second_part(filepath: str) -> None:
-    lines = elf.read_file_rows(filepath)
-    instructions = parse_instructions(lines)
-    cycle_values = execute_program(instructions)
+    instructions = parse_instructions(elf.iter_rows(filepath))
 
     crt_width = 40
     crt_height = 6
     screen = []
 
-    for cycle in range(1, min(len(cycle_values), crt_width * crt_height + 1)):
-        pixel_pos = (cycle - 1) % crt_width
-        sprite_pos = cycle_values[cycle]
+    for cycles, sprite_pos in execute_program(instructions):
+        if cycles.start > crt_width * crt_height:
+            break
+
+        for cycle in range(cycles.start, min(cycles.stop, crt_width * crt_height + 1)):
+            pixel_pos = (cycle - 1) % crt_width
 
-        if abs(pixel_pos - sprite_pos) <= 1:
-            screen.append("#")
-        else:
-            screen.append(".")
+            if abs(pixel_pos - sprite_pos) <= 1:
+                screen.append("#")
+            else:
+                screen.append(".")
 
-        if cycle % crt_width == 0:
-            screen.append("\n")
+            if cycle % crt_width == 0:
+                screen.append("\n")
 
     output = "".join(screen).strip()
     elf.print_solution(2, "\n" + output)
@@ -1,4 +1,4 @@
-import re
+from collections.abc import Iterable, Iterator, Mapping
 from pathlib import Path
 from types import MappingProxyType
 from typing import assert_never
@@ -7,52 +7,104 @@ import elf
 
 SPELL_TO_DIGIT = MappingProxyType(
     {
-        "0": "0",
-        "1": "1",
-        "2": "2",
-        "3": "3",
-        "4": "4",
-        "5": "5",
-        "6": "6",
-        "7": "7",
-        "8": "8",
-        "9": "9",
-        "zero": "0",
-        "one": "1",
-        "two": "2",
-        "three": "3",
-        "four": "4",
-        "five": "5",
-        "six": "6",
-        "seven": "7",
-        "eight": "8",
-        "nine": "9",
+        b"0": 0,
+        b"1": 1,
+        b"2": 2,
+        b"3": 3,
+        b"4": 4,
+        b"5": 5,
+        b"6": 6,
+        b"7": 7,
+        b"8": 8,
+        b"9": 9,
+        b"one": 1,
+        b"two": 2,
+        b"three": 3,
+        b"four": 4,
+        b"five": 5,
+        b"six": 6,
+        b"seven": 7,
+        b"eight": 8,
+        b"nine": 9,
     }
 )
 
-DIGITS_RE = re.compile(r"(?=(\d|one|two|three|four|five|six|seven|eight|nine))")
+DIGITS = b"0123456789"
+NON_DIGITS = bytes(byte for byte in range(256) if byte not in DIGITS)
 
+type Trie = tuple[list[dict[int, int]], list[int | None]]
 
-def solve(rows: list[str]) -> int:
+
+def build_trie(spell_to_digit: Mapping[bytes, int]) -> Trie:
+    """Flat trie, whose nodes are indices into lists of children and of matched digits."""
+    children: list[dict[int, int]] = [{}]
+    digits: list[int | None] = [None]
+    for spell, digit in spell_to_digit.items():
+        node = 0
+        for byte in spell:
+            if byte not in children[node]:
+                children[node][byte] = len(children)
+                children.append({})
+                digits.append(None)
+            node = children[node][byte]
+        digits[node] = digit
+    return children, digits
+
+
+SPELL_TRIE = build_trie(SPELL_TO_DIGIT)
+
+
+def match_at(row: bytes, start: int, trie: Trie) -> int | None:
+    children, digits = trie
+    node = 0
+    # NOTE: Indices are walked instead of slicing, so nothing is copied for every start.
+    for idx in range(start, len(row)):
+        if (node := children[node].get(row[idx], 0)) == 0:
+            return None
+        if (digit := digits[node]) is not None:
+            return digit
+    return None
+
+
+def iter_rows(path: Path) -> Iterator[bytes]:
+    for chunk in elf.iter_chunks(path):
+        yield from chunk.splitlines()
+
+
+def solve_digits(rows: Iterable[bytes]) -> int:
+    out = 0
+    for row in rows:
+        if digits := row.translate(None, NON_DIGITS):
+            out += (digits[0] - ord("0")) * 10 + digits[-1] - ord("0")
+    return out
+
+
+def find_spelled(row: bytes, starts: Iterable[int], trie: Trie) -> int | None:
+    for start in starts:
+        if (digit := match_at(row, start, trie)) is not None:
+            return digit
+    return None
+
+
+def solve_spelled(rows: Iterable[bytes], trie: Trie) -> int:
+    # NOTE: Spells never prefix one another, so at most one of them matches at any start.
+    # First match is found scanning starts forward and last match scanning them backward.
     out = 0
     for row in rows:
-        digits = DIGITS_RE.findall(row)
-        lhs = SPELL_TO_DIGIT[digits[0]]
-        rhs = SPELL_TO_DIGIT[digits[-1]]
-        out += int(f"{lhs}{rhs}")
+        if (lhs := find_spelled(row, range(len(row)), trie)) is None:
+            continue
+        rhs = find_spelled(row, reversed(range(len(row))), trie)
+        assert rhs is not None, "Last match cannot be missing when first one exists"
+        out += lhs * 10 + rhs
     return out
 
 
 def solve_first_part(__p: Path, /) -> None:
-    rows = elf.read_file_rows(__p)
-    solution = solve(rows)
-    elf.print_solution(1, solution)
+    elf.print_solution(1, solve_digits(iter_rows(__p)))
 
 
 def solve_second_part(__p: Path, /) -> None:
-    rows = elf.read_file_rows(__p)
-    solution = solve(rows)
-    elf.print_solution(2, solution)
+    elf.print_solution(2, solve_spelled(iter_rows(__p), SPELL_TRIE))
 
 
 def main() -> None:
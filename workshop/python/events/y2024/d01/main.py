@@ -11,7 +11,7 @@ def parse_items(__p: Path, /) -> tuple[list[int], list[int]]:
     rhs_items: list[int] = []
 
     for lhs_item, rhs_item in (
-        map(int, line.strip().split()) for line in __p.read_text().splitlines()
+        map(int, line.strip().split()) for line in elf.iter_rows(__p)
     ):
         lhs_items.append(lhs_item)
         rhs_items.append(rhs_item)
@@ -20,7 +20,7 @@ def check_if_safe_report(values: Sequence[int], /) -> bool:
 
 
 def solve_first_part(__p: Path, /) -> None:
-    rows = elf.read_file_rows(__p)
+    rows = elf.iter_rows(__p)
     n_safe_reports = sum(
         check_if_safe_report([int(x) for x in row.strip().split()]) for row in rows
     )
@@ -28,7 +28,7 @@ def solve_first_part(__p: Path, /) -> None:
 
 
 def solve_second_part(__p: Path, /) -> None:
-    rows = elf.read_file_rows(__p)
+    rows = elf.iter_rows(__p)
     n_safe_reports = 0
     for row in rows:
         values = [int(x) for x in row.strip().split()]
@@ -1,44 +1,34 @@
 import re
 from pathlib import Path
-from typing import assert_never, cast
+from typing import assert_never
 
 import elf
 
-TYPE_CHECKING = False
-if TYPE_CHECKING:
-    from typing_extensions import TypedDict
-
-    class MatchedMul(TypedDict):
-        lhs: str
-        rhs: str
-
 
 def solve_first_part(__p: Path, /) -> None:
-    MUL_PATTERN = re.compile(r"mul\((?P<lhs>\d{1,3}),(?P<rhs>\d{1,3})\)")
-    rows = elf.read_file_rows(__p)
+    MUL_PATTERN = re.compile(rb"mul\((?P<lhs>\d{1,3}),(?P<rhs>\d{1,3})\)")
     solution = 0
-    for matched_pat in MUL_PATTERN.finditer("".join(rows)):
-        matched_mul = cast("MatchedMul", matched_pat.groupdict())
-        solution += int(matched_mul["lhs"]) * int(matched_mul["rhs"])
+    with elf.map_input(__p) as data:
+        for matched_pat in MUL_PATTERN.finditer(data):
+            solution += int(matched_pat["lhs"]) * int(matched_pat["rhs"])
     elf.print_solution(1, solution)
 
 
 def solve_second_part(__p: Path, /) -> None:
     MUL_PATTERN = re.compile(
-        r"do\(\)|don't\(\)|mul\((?P<lhs>\d{1,3}),(?P<rhs>\d{1,3})\)"
+        rb"do\(\)|don't\(\)|mul\((?P<lhs>\d{1,3}),(?P<rhs>\d{1,3})\)"
     )
-    rows = elf.read_file_rows(__p)
     solution = 0
     mul_enabled: bool = True
-    for matched_pat in MUL_PATTERN.finditer("".join(rows)):
-        match matched_pat.group(0):
-            case "do()":
-                mul_enabled = True
-            case "don't()":
-                mul_enabled = False
-            case _ if mul_enabled:
-                matched_mul = cast("MatchedMul", matched_pat.groupdict())
-                solution += int(matched_mul["lhs"]) * int(matched_mul["rhs"])
+    with elf.map_input(__p) as data:
+        for matched_pat in MUL_PATTERN.finditer(data):
+            match matched_pat.group(0):
+                case b"do()":
+                    mul_enabled = True
+                case b"don't()":
+                    mul_enabled = False
+                case _ if mul_enabled:
+                    solution += int(matched_pat["lhs"]) * int(matched_pat["rhs"])
     elf.print_solution(2, solution)
 
 
@@ -1,16 +1,16 @@
 import itertools
 from collections import defaultdict
 from pathlib import Path
-from typing import assert_never
 
 import elf
 
 type Rules = dict[int, set[int]]
 type Update = list[int]
 type Updates = list[Update]
+type Data = tuple[Rules, Updates]
 
 
-def parse_data(__p: Path, /) -> tuple[Rules, Updates]:
+def parse(__p: Path, /) -> Data:
     lines = elf.read_file_rows(__p)
     sep_idx = lines.index("")
 
@@ -41,8 +41,8 @@ def transform_update_to_satisfy_rules(update: Update, rules: Rules) -> Update:
     return new_update
 
 
-def solve_first_part(__p: Path, /) -> None:
-    rules, updates = parse_data(__p)
+def solve_first_part(data: Data, /) -> None:
+    rules, updates = data
 
     solution = 0
     for update in updates:
@@ -52,8 +52,8 @@ def solve_first_part(__p: Path, /) -> None:
     elf.print_solution(1, solution)
 
 
-def solve_second_part(__p: Path, /) -> None:
-    rules, updates = parse_data(__p)
+def solve_second_part(data: Data, /) -> None:
+    rules, updates = data
 
     solution = 0
     for new_update in updates:
@@ -66,15 +66,7 @@ def solve_second_part(__p: Path, /) -> None:
 
 
 def main() -> None:
-    parts, input = elf.parse_command_line()
-    for part in parts:
-        match part:
-            case 1:
-                solve_first_part(input)
-            case 2:
-                solve_second_part(input)
-            case _:
-                assert_never(part)
+    elf.run(solve_first_part, solve_second_part, parse=parse)
 
 
 if __name__ == "__main__":
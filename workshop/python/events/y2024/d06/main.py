@@ -1,82 +1,65 @@
 from pathlib import Path
-from typing import assert_never
 
 import elf
 
-type Grid = dict[Position, str]
-type Position = complex
-type Direction = complex
+type Position = int
+type Direction = tuple[int, int]
+type Data = tuple[elf.Grid, Position]
 
-UP, DOWN, RIGHT, LEFT = (
-    +0 - 1j,  # ↑
-    +0 + 1j,  # ↓
-    +1 + 0j,  # →
-    -1 + 0j,  # ←
-)
+OBSTACLE, FLOOR = ord("#"), ord(".")
 
-TURN_RULES = {UP: RIGHT, RIGHT: DOWN, DOWN: LEFT, LEFT: UP}
+TURN_RULES = {
+    elf.UP: elf.RIGHT,
+    elf.RIGHT: elf.DOWN,
+    elf.DOWN: elf.LEFT,
+    elf.LEFT: elf.UP,
+}
 
 
-def parse_input(__p: Path, /) -> tuple[Grid, Position]:
-    grid = {
-        x + y * 1j: char
-        for y, row in enumerate(elf.read_file_rows(__p))
-        for x, char in enumerate(row)
-    }
-
-    for pos, char in grid.items():
-        if char == "^":
-            start_position = pos
-            grid[pos] = "."
-            break
-    else:
+def parse(__p: Path, /) -> Data:
+    grid = elf.Grid.read(__p)
+    if (start_position := grid.find(b"^")) == -1:
         raise RuntimeError("Invalid map")
-
+    grid[start_position] = FLOOR
     return grid, start_position
 
 
 def find_nonblocking_positions(
-    grid: Grid, start_position: Position, start_direction: Direction
+    grid: elf.Grid, start_position: Position, start_direction: Direction
 ) -> set[Position]:
     direction = start_direction
     visited = {start_position}
     while True:
-        match grid.get(next_pos := start_position + direction):
-            case None:
-                break
-            case "#":
+        # NOTE: Guard walks the whole ray up to an obstacle, or leaves the map at its end.
+        for next_pos in grid.ray(start_position, direction):
+            cell = grid.cells[next_pos]
+            if cell == OBSTACLE:
                 direction = TURN_RULES[direction]
-            case ".":
-                visited.add(next_pos)
-                start_position = next_pos
-            case _:
+                break
+            if cell != FLOOR:
                 raise RuntimeError("Invalid map")
+            visited.add(next_pos)
+            start_position = next_pos
+        else:
+            break
     return visited
 
 
-def solve_first_part(__p: Path, /) -> None:
-    grid, start_position = parse_input(__p)
-    visited = find_nonblocking_positions(grid, start_position, UP)
+def solve_first_part(data: Data, /) -> None:
+    grid, start_position = data
+    visited = find_nonblocking_positions(grid, start_position, elf.UP)
     elf.print_solution(1, len(visited))
 
 
-def solve_second_part(__p: Path, /) -> None:
-    grid, start_position = parse_input(__p)
-    visited = find_nonblocking_positions(grid, start_position, UP)
+def solve_second_part(data: Data, /) -> None:
+    grid, start_position = data
+    visited = find_nonblocking_positions(grid, start_position, elf.UP)
     solution = 0
     elf.print_solution(2, solution)
 
 
 def main() -> None:
-    parts, input = elf.parse_command_line()
-    for part in parts:
-        match part:
-            case 1:
-                solve_first_part(input)
-            case 2:
-                solve_second_part(input)
-            case _:
-                assert_never(part)
+    elf.run(solve_first_part, solve_second_part, parse=parse)
 
 
 if __name__ == "__main__":